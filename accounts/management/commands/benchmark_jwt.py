@@ -0,0 +1,76 @@
+import time
+from datetime import datetime, timezone
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from jwt.algorithms import get_default_algorithms
+
+
+class Command(BaseCommand):
+    """
+    Management command comparing JWT sign/verify throughput of HS256, RS256 and
+    EdDSA, including the cost of parsing the PEM on every verification versus
+    reusing a parsed key (what utilities.jwt_keys.KeySet does).
+    """
+    help = "Benchmarks JWT signing and verification per algorithm"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=2000,
+            help="Operations per measurement (default: 2000)"
+        )
+
+    def handle(self, *args, **options) -> None:
+        iterations = options['iterations']
+        payload = {
+            'user_id': 1,
+            'username': 'benchmark',
+            'ver': 0,
+            'exp': datetime.now(timezone.utc) + settings.JWT_EXPIRATION_DELTA,
+            'iat': datetime.now(timezone.utc),
+        }
+
+        self.stdout.write(f"{'algorithm':<10}{'sign/s':>12}{'verify/s':>12}{'verify+PEM/s':>14}")
+        for algorithm, signing_key, public_pem in self.keys():
+            if public_pem is None:
+                verify_key = signing_key
+            else:
+                verify_key = get_default_algorithms()[algorithm].prepare_key(public_pem)
+
+            token = jwt.encode(payload, signing_key, algorithm=algorithm)
+            sign_rate = self.rate(
+                iterations, lambda: jwt.encode(payload, signing_key, algorithm=algorithm)
+            )
+            verify_rate = self.rate(
+                iterations, lambda: jwt.decode(token, verify_key, algorithms=[algorithm])
+            )
+            pem_rate = '-'
+            if public_pem is not None:
+                pem_rate = f"{self.rate(iterations, lambda: jwt.decode(token, public_pem, algorithms=[algorithm])):.0f}"
+
+            self.stdout.write(f"{algorithm:<10}{sign_rate:>12.0f}{verify_rate:>12.0f}{pem_rate:>14}")
+
+    def keys(self):
+        """Yield (algorithm, signing key, public PEM or None for HMAC)"""
+        yield 'HS256', settings.JWT_SECRET_KEY, None
+
+        for algorithm, private_key in (
+            ('RS256', rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+            ('EdDSA', ed25519.Ed25519PrivateKey.generate()),
+        ):
+            public_pem = private_key.public_key().public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            ).decode('ascii')
+            yield algorithm, private_key, public_pem
+
+    def rate(self, iterations, operation):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            operation()
+        return iterations / (time.perf_counter() - start)
@@ -0,0 +1,135 @@
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from utilities.jwt_keys import ASYMMETRIC_ALGORITHMS, is_asymmetric
+
+
+class Command(BaseCommand):
+    """
+    Management command to rotate the JWT signing key.
+
+    A new key pair is added to the key set and becomes the active signing key.
+    Previous keys stay in the set so tokens they signed keep verifying, and are
+    pruned once they have been retired for longer than JWT_EXPIRATION_DELTA.
+    """
+    help = "Generates a new JWT signing key, makes it active and prunes expired keys"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--keyset',
+            default=getattr(settings, 'JWT_KEYSET_FILE', ''),
+            help="Key set file to update (default: JWT_KEYSET_FILE)"
+        )
+        parser.add_argument(
+            '--algorithm',
+            choices=ASYMMETRIC_ALGORITHMS,
+            default=settings.JWT_ALGORITHM if is_asymmetric(settings.JWT_ALGORITHM) else 'RS256',
+            help="Algorithm of the new key (default: JWT_ALGORITHM, or RS256)"
+        )
+        parser.add_argument(
+            '--no-prune',
+            action='store_true',
+            help="Keep retired keys even when no valid token can use them anymore"
+        )
+        parser.add_argument(
+            '--export-public',
+            help="Also write a public-only key set to this path for services that verify tokens"
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not options['keyset']:
+            raise CommandError("No key set file: pass --keyset or set JWT_KEYSET_FILE")
+
+        path = Path(options['keyset'])
+        keyset = {'active': None, 'keys': []}
+        if path.exists():
+            with open(path) as keyset_file:
+                keyset = json.load(keyset_file)
+
+        now = datetime.now(timezone.utc)
+        for key in keyset['keys']:
+            if key['kid'] == keyset['active'] and not key.get('retired_at'):
+                key['retired_at'] = now.isoformat()
+
+        new_key = self.generate_key(options['algorithm'], now)
+        keyset['keys'].append(new_key)
+        keyset['active'] = new_key['kid']
+
+        if not options['no_prune']:
+            keyset['keys'] = self.prune(keyset['keys'], now)
+
+        self.write(path, keyset, private=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"Active signing key is now {new_key['kid']} ({new_key['alg']}), "
+            f"{len(keyset['keys'])} key(s) in {path}"
+        ))
+
+        if options['export_public']:
+            public = {
+                'active': keyset['active'],
+                'keys': [
+                    {k: v for k, v in key.items() if k != 'private_key'}
+                    for key in keyset['keys']
+                ],
+            }
+            self.write(Path(options['export_public']), public, private=False)
+            self.stdout.write(f"Public key set written to {options['export_public']}")
+
+    def generate_key(self, algorithm, now):
+        """Create a key pair for algorithm as a key set entry"""
+        if algorithm.startswith('RS'):
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        elif algorithm == 'ES256':
+            private_key = ec.generate_private_key(ec.SECP256R1())
+        elif algorithm == 'ES384':
+            private_key = ec.generate_private_key(ec.SECP384R1())
+        else:
+            private_key = ed25519.Ed25519PrivateKey.generate()
+
+        private_pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ).decode('ascii')
+        public_pem = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode('ascii')
+
+        return {
+            'kid': uuid.uuid4().hex,
+            'alg': algorithm,
+            'private_key': private_pem,
+            'public_key': public_pem,
+            'created_at': now.isoformat(),
+            'retired_at': None,
+        }
+
+    def prune(self, keys, now):
+        """Drop keys retired for longer than any token they signed can live"""
+        cutoff = now - settings.JWT_EXPIRATION_DELTA - timedelta(minutes=5)
+        kept = []
+        for key in keys:
+            retired_at = key.get('retired_at')
+            if retired_at and datetime.fromisoformat(retired_at) < cutoff:
+                self.stdout.write(f"Pruned key {key['kid']}")
+                continue
+            kept.append(key)
+        return kept
+
+    def write(self, path, data, private):
+        """Atomically replace path so running workers never read a partial file"""
+        tmp_path = path.with_name(f'.{path.name}.tmp')
+        with open(tmp_path, 'w') as keyset_file:
+            json.dump(data, keyset_file, indent=2)
+        if private:
+            os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
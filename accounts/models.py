@@ -18,6 +18,7 @@ class Account(AbstractBaseUser, BaseModel, PermissionsMixin):
     
     address = models.CharField(max_length=255, blank=True, help_text="Address of the user (e.g., Tilottama-3, Yogikuti, Shantichowk, near futsal Brahmapath)")  
     is_staff = models.BooleanField(default=False)
+    token_version = models.PositiveIntegerField(default=0, editable=False, help_text="Bumped to invalidate every token issued to this account")
 
     USERNAME_FIELD = 'username'
     REQUIRED_FIELDS = []
@@ -36,6 +37,18 @@ class Account(AbstractBaseUser, BaseModel, PermissionsMixin):
     def __str__(self):
         return self.username
 
+    def save(self, *args, **kwargs):
+        # A password set through set_password() (``_password`` is cleared again
+        # for hash upgrades on login) or a deactivation invalidates issued tokens
+        password_changed = self._password is not None and not self._state.adding
+        deactivated = self.field_has_changed('is_active') and not self.is_active
+        if password_changed or deactivated:
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'token_version' not in update_fields:
+                kwargs['update_fields'] = [*update_fields, 'token_version']
+        super().save(*args, **kwargs)
+
   
   
 
@@ -46,3 +59,43 @@ class Account(AbstractBaseUser, BaseModel, PermissionsMixin):
             designation = 'superUser'
         return designation    
 
+
+
+class RefreshToken(BaseModel):
+    """
+    Long-lived refresh token, stored only as a SHA-256 hash.
+
+    Each refresh rotates the token: the presented row is marked used and a new
+    one is issued in the same ``family``. Presenting a used token again means it
+    was copied, so the whole family is revoked.
+    """
+    user = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="refresh_tokens")
+    token_hash = models.CharField(max_length=64, unique=True)
+    family = models.CharField(max_length=32, db_index=True, help_text="Rotation chain this token belongs to")
+    expires_at = models.DateTimeField()
+    used_at = models.DateTimeField(null=True, blank=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "refresh_tokens"
+        ordering = ['-created_at']
+        verbose_name = 'Refresh Token'
+        verbose_name_plural = 'Refresh Tokens'
+
+    def __str__(self):
+        return f"{self.user_id}:{self.family}"
+
+
+class RevokedToken(BaseModel):
+    """Access token ``jti`` revoked before its expiry (source of truth for the revocation list)"""
+    jti = models.CharField(max_length=32, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "revoked_tokens"
+        ordering = ['-created_at']
+        verbose_name = 'Revoked Token'
+        verbose_name_plural = 'Revoked Tokens'
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import Account
+from utilities.user_cache import user_cache
+
+
+@receiver(post_save, sender=Account)
+def evict_saved_account(sender, instance, **kwargs):
+    """
+    Any write to an account (password change, deactivation, profile edit)
+    drops it from the JWT user cache, so the next request reloads it, and
+    publishes its token_version for stateless token checks.
+    """
+    user_cache.evict(instance.pk)
+    user_cache.set_token_version(instance.pk, instance.token_version)
+
+
+@receiver(post_delete, sender=Account)
+def evict_deleted_account(sender, instance, **kwargs):
+    """A deleted account matches no token version"""
+    user_cache.evict(instance.pk)
+    user_cache.set_token_version(instance.pk, -1)
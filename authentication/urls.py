@@ -1,11 +1,18 @@
 
 from django.urls import path
 
-from authentication.views import LoginApiView, RegisterApiView
+from authentication.views import (
+    LoginApiView,
+    LogoutApiView,
+    RefreshTokenApiView,
+    RegisterApiView,
+)
 
 
 urlpatterns = [
 
      path("register/", RegisterApiView.as_view(), name="register-account"),
      path("login/", LoginApiView.as_view(), name="login"),
+     path("refresh/", RefreshTokenApiView.as_view(), name="token-refresh"),
+     path("logout/", LogoutApiView.as_view(), name="logout"),
 ]
\ No newline at end of file
@@ -1,8 +1,7 @@
-from django.http import JsonResponse
 from django.contrib.auth import get_user_model
 import json
 
-from utilities.jwt_utils import decode_jwt_token
+from utilities.jwt_utils import authenticate_request
 
 User = get_user_model()
 
@@ -15,29 +14,10 @@ class JWTAuthenticationMixin:
         if self.is_public_endpoint(request):
             return super().dispatch(request, *args, **kwargs)
 
-        # Get token from Authorization header
-        auth_header = request.META.get("HTTP_AUTHORIZATION")
-        if not auth_header:
-            return JsonResponse({"error": "Authorization header required"}, status=401)
-
-        try:
-            # Extract token from "Bearer <token>"
-            token_type, token = auth_header.split(" ")
-            if token_type.lower() != "bearer":
-                return JsonResponse({"error": "Invalid token type"}, status=401)
-
-            # Decode token and get user
-            user = decode_jwt_token(token)
-            request.user = user
-
-        except ValueError:
-            return JsonResponse(
-                {"error": "Invalid authorization header format"}, status=401
-            )
-        except Exception as e:
-            if "expired" in str(e).lower():
-                return JsonResponse({"error": "Token has expired"}, status=401)
-            return JsonResponse({"error": "Invalid token"}, status=401)
+        # Verify the token once and attach claims plus a lazily loaded user
+        error_response = authenticate_request(request)
+        if error_response:
+            return error_response
 
         return super().dispatch(request, *args, **kwargs)
 
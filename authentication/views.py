@@ -1,19 +1,39 @@
 import logging
+import math
 
+from django.conf import settings
 from django.utils.decorators import method_decorator
 import json
 from django.http import JsonResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.contrib.auth import authenticate
 from accounts.models import Account
 from django.db import IntegrityError
-from utilities.jwt_utils import generate_jwt_token
+from utilities.decorators import jwt_required
+from utilities.jwt_utils import AuthenticationFailed, generate_jwt_token, revoke_token
+from utilities.metrics import registry
+from utilities.password_pool import PasswordPoolBusy, password_verifier
+from utilities.refresh_tokens import (
+    issue_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
+from utilities.throttling import TokenBucket, get_client_ip
 
 
 logger = logging.getLogger(__name__)
 
+login_ip_throttle = TokenBucket('login-ip', settings.LOGIN_THROTTLE_IP_RATE)
+login_username_throttle = TokenBucket('login-username', settings.LOGIN_THROTTLE_USERNAME_RATE)
+login_throttles = (('ip', login_ip_throttle), ('username', login_username_throttle))
+login_throttled_total = registry.counter(
+    'login_throttled_total', 'Login attempts refused by a throttle', labelnames=('scope',)
+)
+login_failures_total = registry.counter(
+    'login_failures_total', 'Login attempts with invalid credentials'
+)
+
 @method_decorator(csrf_exempt, name='dispatch')
 class RegisterApiView(View):
     """User registration endpoint"""
@@ -70,6 +90,29 @@ class LoginApiView(View):
         response["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
         return response
 
+    @staticmethod
+    def get_throttle_keys(request, username):
+        """Bucket keys of a login attempt: the client IP and the username"""
+        return {"ip": get_client_ip(request), "username": username.lower()}
+
+    def throttle(self, keys):
+        """
+        Return a 429 response if the client IP or the username is over its
+        rate. Nothing is charged for refused attempts; otherwise the attempt
+        takes an IP token (failed logins also take a username token).
+        """
+        for scope, bucket in login_throttles:
+            allowed, retry_after = bucket.peek(keys[scope])
+            if not allowed:
+                login_throttled_total.inc(scope=scope)
+                response = JsonResponse(
+                    {"error": "Too many login attempts, try again later"}, status=429
+                )
+                response["Retry-After"] = str(math.ceil(retry_after))
+                return response
+        login_ip_throttle.consume(keys["ip"])
+        return None
+
     def post(self, request):
         try:
             data = json.loads(request.body)
@@ -81,10 +124,27 @@ class LoginApiView(View):
                 return JsonResponse(
                     {"error": "Username and password are required"}, status=400
                 )
+            if not isinstance(username, str) or not isinstance(password, str):
+                return JsonResponse(
+                    {"error": "Username and password must be strings"}, status=400
+                )
+
+            # Throttle before hashing so floods never reach the password hasher
+            throttle_keys = self.get_throttle_keys(request, username)
+            throttled_response = self.throttle(throttle_keys)
+            if throttled_response:
+                return throttled_response
 
             # Authenticate user
-            user = authenticate(username=username, password=password)
+            try:
+                user = password_verifier.authenticate(username=username, password=password)
+            except PasswordPoolBusy as e:
+                response = JsonResponse({"error": str(e)}, status=429)
+                response["Retry-After"] = "1"
+                return response
             if not user:
+                login_failures_total.inc()
+                login_username_throttle.consume(throttle_keys["username"])
                 return JsonResponse({"error": "Invalid credentials"}, status=401)
             
 
@@ -93,6 +153,7 @@ class LoginApiView(View):
 
             response_data = {
                 "token": token,
+                "refresh_token": issue_refresh_token(user),
                 "user": {
                     "id": user.id,
                     "username": user.username,
@@ -104,4 +165,61 @@ class LoginApiView(View):
         except json.JSONDecodeError:
             return JsonResponse({"error": "Invalid JSON"}, status=400)
         except Exception as e:
-            return JsonResponse({"error": str(e)}, status=500)
\ No newline at end of file
+            return JsonResponse({"error": str(e)}, status=500)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class RefreshTokenApiView(View):
+    """Exchange a refresh token for a new access token and a rotated refresh token"""
+
+    def options(self, request, *args, **kwargs):
+        """Handle preflight requests"""
+        response = JsonResponse({})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+        response["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+        return response
+
+    def post(self, request):
+        try:
+            data = json.loads(request.body)
+            refresh_token = data.get("refresh_token")
+
+            if not refresh_token:
+                return JsonResponse({"error": "refresh_token is required"}, status=400)
+
+            user, new_refresh_token = rotate_refresh_token(refresh_token)
+
+            return JsonResponse({
+                "token": generate_jwt_token(user),
+                "refresh_token": new_refresh_token,
+            })
+
+        except AuthenticationFailed as e:
+            return JsonResponse({"error": str(e)}, status=401)
+        except json.JSONDecodeError:
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=500)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class LogoutApiView(View):
+    """Revoke the presented access token and, if given, its refresh token chain"""
+
+    @jwt_required
+    def post(self, request):
+        try:
+            data = json.loads(request.body) if request.body else {}
+            refresh_token = data.get("refresh_token")
+
+            revoke_token(request.jwt_payload)
+            if refresh_token:
+                revoke_refresh_token(refresh_token, user=request.user)
+
+            return JsonResponse({"message": "Logged out successfully"})
+
+        except json.JSONDecodeError:
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=500)
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class BlogsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blogs'
+
+    def ready(self):
+        # Register signal handlers
+        from django.db.models.signals import pre_migrate
+
+        from blogs import signals
+
+        # Not a migration: migrations are generated per deployment, and a
+        # committed one would fork their graphs
+        pre_migrate.connect(signals.create_trigram_extension, sender=self)
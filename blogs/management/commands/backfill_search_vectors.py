@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.db.models import Max, Min
+
+from blogs.models import Post
+from utilities.search import supports_full_text
+
+
+class Command(BaseCommand):
+    """
+    Management command to (re)build Post.search_vector in primary key batches,
+    e.g. after adding the column or after rows were written with bulk_create/update().
+    """
+    help = "Backfills the full-text search_vector column of posts in batches"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Number of primary keys covered by each UPDATE (default: 1000)"
+        )
+        parser.add_argument(
+            '--missing-only',
+            action='store_true',
+            help="Only fill rows whose search_vector is NULL"
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not supports_full_text():
+            raise CommandError("Full-text search vectors require a PostgreSQL database")
+
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        queryset = Post.objects.all()
+        if options['missing_only']:
+            queryset = queryset.filter(search_vector__isnull=True)
+
+        bounds = queryset.aggregate(low=Min('id'), high=Max('id'))
+        if bounds['low'] is None:
+            self.stdout.write("No posts to backfill.")
+            return
+
+        expression = Post.search_vector_expression()
+        updated = 0
+        for start in range(bounds['low'], bounds['high'] + 1, batch_size):
+            # Short transactions keep row locks brief on a live table
+            with transaction.atomic():
+                updated += queryset.filter(
+                    id__gte=start, id__lt=start + batch_size
+                ).update(search_vector=expression)
+            self.stdout.write(f"Processed ids {start}-{start + batch_size - 1} ({updated} updated)")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled search vectors for {updated} posts"))
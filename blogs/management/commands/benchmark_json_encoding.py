@@ -0,0 +1,109 @@
+import json
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from accounts.models import Account
+from blogs.models import Post
+from utilities.json_encoding import JSON_ENCODERS, orjson
+
+
+class Command(BaseCommand):
+    """
+    Management command comparing JSON encoding of post list pages: the former
+    path (isoformat() strings through JsonResponse's DjangoJSONEncoder) against
+    each encoder of utilities.json_encoding fed native datetimes. Pages are
+    built in memory from unsaved posts, so no database is needed.
+    """
+    help = "Benchmarks JSON encoders on realistic post list pages"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--page-sizes',
+            type=int,
+            nargs='+',
+            default=[10, 50, 100],
+            help="Posts per page (default: 10 50 100)"
+        )
+        parser.add_argument(
+            '--content-size',
+            type=int,
+            default=4000,
+            help="Characters of content per post (default: 4000)"
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help="Encodings per measurement (default: 200)"
+        )
+
+    def handle(self, *args, **options) -> None:
+        encoders = [('django (before)', self.encode_before)]
+        for name, encoder_class in JSON_ENCODERS.items():
+            if name == 'orjson' and orjson is None:
+                self.stdout.write("orjson is not installed, skipping it")
+                continue
+            encoders.append((name, encoder_class().dumps))
+
+        self.stdout.write(f"{'page':>6}{'encoder':>18}{'pages/s':>12}{'MB/s':>10}{'ms/page':>10}")
+        for page_size in options['page_sizes']:
+            page = self.build_page(page_size, options['content_size'])
+            for name, dumps in encoders:
+                payload = page if name != 'django (before)' else self.with_isoformat(page)
+                size = len(dumps(payload))
+                iterations = options['iterations']
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    dumps(payload)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{page_size:>6}{name:>18}{iterations / elapsed:>12.0f}"
+                    f"{size * iterations / elapsed / 1e6:>10.1f}{elapsed / iterations * 1000:>10.3f}"
+                )
+
+    def encode_before(self, data):
+        # What JsonResponse did with the dicts before
+        return json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
+
+    def with_isoformat(self, page):
+        return {
+            **page,
+            'posts': [
+                {**post, 'created_at': post['created_at'].isoformat(), 'updated_at': post['updated_at'].isoformat()}
+                for post in page['posts']
+            ],
+        }
+
+    def build_page(self, page_size, content_size):
+        author = Account(id=1, username='benchmark')
+        words = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor. "
+        content = (words * (content_size // len(words) + 1))[:content_size]
+        now = timezone.now()
+        posts = []
+        for index in range(page_size):
+            post = Post(
+                id=index + 1,
+                title=f"Benchmark post number {index}",
+                content=content,
+                author=author,
+                is_active=True,
+            )
+            post.created_at = now - timedelta(minutes=index)
+            post.updated_at = now - timedelta(seconds=index)
+            posts.append(post.to_dict())
+        return {
+            'posts': posts,
+            'pagination': {
+                'page': 1,
+                'pages': 10,
+                'per_page': page_size,
+                'total': page_size * 10,
+                'has_next': True,
+                'has_previous': False,
+                'count_strategy': 'cached',
+            },
+        }
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.http import HttpResponse
+from django.test import AsyncClient, Client, RequestFactory, override_settings
+from django.urls import path
+from django.utils.module_loading import import_string
+
+
+def sync_view(request):
+    return HttpResponse(b'ok')
+
+
+async def async_view(request):
+    return HttpResponse(b'ok')
+
+
+# Trivial views under /api/ so the whole cost measured is the middleware chain
+urlpatterns = [
+    path('api/benchmark/sync/', sync_view),
+    path('api/benchmark/async/', async_view),
+]
+
+
+class Command(BaseCommand):
+    """
+    Management command measuring the per-request overhead of the project's
+    own middleware (the utilities.middleware entries of MIDDLEWARE).
+
+    Each middleware is first called directly around a trivial view, in a
+    sync and an async chain (adapted the way Django's handler would when it
+    is not async capable). Then requests to a trivial view go through the
+    whole configured chain with and without those entries, through the WSGI
+    handler (sync view) and the ASGI handler (async view). The fastest of a
+    few rounds is reported. Request logging runs as configured, so its
+    handlers are part of the measurement.
+    """
+    help = "Benchmarks the per-request overhead of the project middleware under WSGI and ASGI"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help="Requests per measurement (default: 2000)"
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=5,
+            help="Measurements per chain, the fastest one is reported (default: 5)"
+        )
+        parser.add_argument(
+            '--prefix',
+            default='utilities.middleware.',
+            help="Middleware entries to measure, by dotted path prefix (default: utilities.middleware.)"
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.requests = options['requests']
+        self.rounds = options['rounds']
+        measured = [name for name in settings.MIDDLEWARE if name.startswith(options['prefix'])]
+        if not measured:
+            raise CommandError(f"No middleware in MIDDLEWARE starts with {options['prefix']!r}")
+
+        request = RequestFactory().get('/api/benchmark/')
+        self.stdout.write(f"{'middleware':>28}{'mode':>8}{'us/req':>10}{'overhead':>10}")
+        for mode, runner in (('sync', self.run_sync), ('async', self.run_async)):
+            baseline = self.measure(runner(None, request))
+            self.stdout.write(f"{'(none)':>28}{mode:>8}{baseline * 1e6:>10.2f}{0:>10.2f}")
+            for name in measured:
+                elapsed = self.measure(runner(import_string(name), request))
+                self.stdout.write(
+                    f"{name.rsplit('.', 1)[-1]:>28}{mode:>8}{elapsed * 1e6:>10.2f}"
+                    f"{(elapsed - baseline) * 1e6:>10.2f}"
+                )
+
+        chains = [
+            ('without', [name for name in settings.MIDDLEWARE if name not in measured]),
+            ('with', list(settings.MIDDLEWARE)),
+        ]
+        self.stdout.write(f"\n{'handler':>8}{'chain':>10}{'us/req':>10}{'overhead':>10}")
+        for handler, run in (('wsgi', self.run_wsgi), ('asgi', self.run_asgi)):
+            baseline = None
+            for chain, middleware in chains:
+                with override_settings(MIDDLEWARE=middleware, ROOT_URLCONF=__name__):
+                    elapsed = self.measure(run)
+                baseline = elapsed if baseline is None else baseline
+                self.stdout.write(
+                    f"{handler:>8}{chain:>10}{elapsed * 1e6:>10.1f}{(elapsed - baseline) * 1e6:>10.1f}"
+                )
+
+    def measure(self, run):
+        """Seconds per request of the fastest round of run(requests)"""
+        run(min(self.requests, 100))  # warm up
+        return min(run(self.requests) for _ in range(self.rounds)) / self.requests
+
+    def run_sync(self, middleware_class, request):
+        call = middleware_class(sync_view) if middleware_class else sync_view
+
+        def run(requests):
+            started = time.perf_counter()
+            for _ in range(requests):
+                call(request)
+            return time.perf_counter() - started
+
+        return run
+
+    def run_async(self, middleware_class, request):
+        if middleware_class is None:
+            call = async_view
+        elif getattr(middleware_class, 'async_capable', False):
+            call = middleware_class(async_view)
+        else:
+            # What BaseHandler.load_middleware() does for sync only middleware
+            call = sync_to_async(middleware_class(async_to_sync(async_view)), thread_sensitive=True)
+
+        def run(requests):
+            async def loop():
+                started = time.perf_counter()
+                for _ in range(requests):
+                    await call(request)
+                return time.perf_counter() - started
+
+            return asyncio.run(loop())
+
+        return run
+
+    def run_wsgi(self, requests):
+        client = Client()
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.get('/api/benchmark/sync/')
+        return time.perf_counter() - started
+
+    def run_asgi(self, requests):
+        async def run():
+            client = AsyncClient()
+            started = time.perf_counter()
+            for _ in range(requests):
+                await client.get('/api/benchmark/async/')
+            return time.perf_counter() - started
+
+        return asyncio.run(run())
@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from blogs.models import Post
+from blogs.serializers import PostSerializer
+
+
+class Command(BaseCommand):
+    """
+    Management command comparing the two ways of building post list pages
+    from the database: model instances (``select_related('author')`` and
+    ``to_dict()``, the former list view path) against PostSerializer's
+    ``values()`` rows. Both run the same query against the configured
+    database, so it needs at least the largest page size of published posts.
+    """
+    help = "Benchmarks model instances against values() rows for post list pages"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--page-sizes',
+            type=int,
+            nargs='+',
+            default=[10, 50, 100],
+            help="Posts per page (default: 10 50 100)"
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help="Pages built per measurement (default: 200)"
+        )
+        parser.add_argument(
+            '--fields',
+            default=None,
+            help="Comma separated fields to serialize (default: all of them)"
+        )
+
+    def handle(self, *args, **options) -> None:
+        fields = options['fields'].split(',') if options['fields'] else None
+        try:
+            serializer = PostSerializer(fields)
+        except ValueError as e:
+            raise CommandError(str(e))
+        if 'excerpt' in serializer.field_names:
+            raise CommandError("excerpt is an annotation of the list views, leave it out here")
+
+        queryset = Post.objects.filter(is_active=True).order_by('-created_at')
+        available = queryset.count()
+        if available < max(options['page_sizes']):
+            raise CommandError(f"Only {available} published posts, import more or pass smaller --page-sizes")
+
+        paths = [
+            ('models', lambda size: [
+                post.to_dict(fields=fields)
+                for post in queryset.select_related('author').defer('search_vector')[:size]
+            ]),
+            ('values', lambda size: serializer.serialize_many(serializer.values(queryset)[:size])),
+        ]
+
+        self.stdout.write(f"{'page':>6}{'path':>10}{'ms/page':>10}{'us/row':>10}{'speedup':>10}")
+        for page_size in options['page_sizes']:
+            baseline = None
+            for name, build in paths:
+                build(page_size)  # warm up
+                iterations = options['iterations']
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    build(page_size)
+                elapsed = (time.perf_counter() - started) / iterations
+                baseline = baseline or elapsed
+                self.stdout.write(
+                    f"{page_size:>6}{name:>10}{elapsed * 1000:>10.3f}"
+                    f"{elapsed / page_size * 1e6:>10.1f}{baseline / elapsed:>9.1f}x"
+                )
@@ -0,0 +1,242 @@
+import asyncio
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client
+from django.urls import resolve, reverse
+
+from utilities.response_cache import response_cache
+
+
+class Command(BaseCommand):
+    """
+    Management command firing concurrent GETs at the post list endpoint and
+    reporting latency percentiles, status codes and X-Cache results.
+
+    By default requests run in-process through Django's test client, one
+    client and database connection per thread, and the SQL each request runs
+    is counted, which shows how many requests actually rebuilt the page
+    (``COUNT(*)`` queries). ``--url`` sends real HTTP requests to a running
+    server instead. ``--asgi`` drives the in-process ASGI handler from
+    ``--concurrency`` asyncio tasks rather than threads; run it with
+    ``ASYNC_VIEWS=True`` to serve the native async views. ``--cache-timeout``
+    and ``--invalidate-every`` make cache entries expire or go stale during
+    the run, and ``--unprotected`` turns off single-flight, stale serving and
+    early expiry for comparison.
+    """
+    help = "Load tests GET /api/posts/ (or --path) with concurrent requests"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help="Total number of requests (default: 2000)"
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=32,
+            help="Number of concurrent workers (default: 32)"
+        )
+        parser.add_argument(
+            '--path',
+            default=None,
+            help="Path and query string to request (default: the post-list URL)"
+        )
+        parser.add_argument(
+            '--url',
+            default=None,
+            help="Base URL of a running server, e.g. http://127.0.0.1:8000 (default: in-process)"
+        )
+        parser.add_argument(
+            '--asgi',
+            action='store_true',
+            help="Go through Django's ASGI handler with concurrent asyncio tasks (in-process only)"
+        )
+        parser.add_argument(
+            '--header',
+            action='append',
+            default=[],
+            help="Extra request header as 'Name: value', e.g. an Authorization bearer token (repeatable)"
+        )
+        parser.add_argument(
+            '--cache-timeout',
+            type=float,
+            default=None,
+            help="Override RESPONSE_CACHE_TIMEOUT in seconds (in-process only)"
+        )
+        parser.add_argument(
+            '--invalidate-every',
+            type=float,
+            default=0,
+            help="Bump the list generation every N seconds during the run, simulating writes"
+        )
+        parser.add_argument(
+            '--unprotected',
+            action='store_true',
+            help="Disable single-flight, stale-while-revalidate and early expiry (in-process only)"
+        )
+
+    def handle(self, *args, **options) -> None:
+        total = options['requests']
+        concurrency = options['concurrency']
+        if total < 1 or concurrency < 1:
+            raise CommandError("--requests and --concurrency must be positive integers")
+
+        path = options['path'] or reverse('post-list')
+        base_url = options['url']
+        if base_url is None:
+            if options['cache_timeout'] is not None:
+                settings.RESPONSE_CACHE_TIMEOUT = options['cache_timeout']
+            if options['unprotected']:
+                # Without the wait, requests missing the lock rebuild too
+                settings.RESPONSE_CACHE_LOCK_WAIT = 0
+                settings.RESPONSE_CACHE_STALE_TTL = 0
+                settings.RESPONSE_CACHE_EARLY_EXPIRY_BETA = 0
+        elif options['cache_timeout'] is not None or options['unprotected'] or options['asgi']:
+            raise CommandError("--cache-timeout, --unprotected and --asgi only apply to in-process runs")
+
+        headers = {}
+        for header in options['header']:
+            name, separator, value = header.partition(':')
+            if not separator:
+                raise CommandError(f"--header must look like 'Name: value', got {header!r}")
+            headers[name.strip()] = value.strip()
+
+        results = []
+        results_lock = threading.Lock()
+        remaining = iter(range(total))
+        remaining_lock = threading.Lock()
+        stop = threading.Event()
+
+        def next_request():
+            with remaining_lock:
+                return next(remaining, None)
+
+        def worker():
+            client = Client(headers=headers) if base_url is None else None
+            queries = Counter()
+
+            def count_queries(execute, sql, params, many, context):
+                queries['total'] += 1
+                if 'COUNT(' in sql:
+                    queries['count'] += 1
+                return execute(sql, params, many, context)
+
+            local_results = []
+            with connection.execute_wrapper(count_queries):
+                while next_request() is not None:
+                    started = time.perf_counter()
+                    status, cache_result = self.fetch(client, base_url, path, headers)
+                    local_results.append((time.perf_counter() - started, status, cache_result))
+            connection.close()
+            with results_lock:
+                results.extend(local_results)
+            return queries
+
+        def invalidator():
+            while not stop.wait(options['invalidate_every']):
+                response_cache.bump_version('list')
+
+        if options['invalidate_every'] > 0:
+            threading.Thread(target=invalidator, daemon=True).start()
+
+        started = time.perf_counter()
+        if options['asgi']:
+            results, queries = asyncio.run(self.run_asgi(path, headers, total, concurrency))
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                query_counts = [future.result() for future in [executor.submit(worker) for _ in range(concurrency)]]
+            queries = sum(query_counts, Counter())
+        elapsed = time.perf_counter() - started
+        stop.set()
+
+        self.report(path, base_url, results, elapsed, concurrency, queries, options['asgi'])
+
+    async def run_asgi(self, path, headers, total, concurrency):
+        """Send the requests through AsyncClient from concurrency tasks, return (results, queries)"""
+        queries = Counter()
+        queries_lock = threading.Lock()
+
+        def count_queries(execute, sql, params, many, context):
+            with queries_lock:
+                queries['total'] += 1
+                if 'COUNT(' in sql:
+                    queries['count'] += 1
+            return execute(sql, params, many, context)
+
+        # The ORM runs in the handler's worker threads, each with its own connection
+        def install_wrapper(sender, connection, **kwargs):
+            connection.execute_wrappers.append(count_queries)
+
+        connection_created.connect(install_wrapper)
+        remaining = iter(range(total))
+        results = []
+
+        async def worker():
+            client = AsyncClient(headers=headers)
+            while next(remaining, None) is not None:
+                started = time.perf_counter()
+                response = await client.get(path)
+                if response.streaming:
+                    async for _ in response.streaming_content:
+                        pass
+                results.append((time.perf_counter() - started, response.status_code, response.get('X-Cache', '-')))
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        finally:
+            connection_created.disconnect(install_wrapper)
+        return results, queries
+
+    def fetch(self, client, base_url, path, headers):
+        """Return (status, X-Cache) of one request"""
+        if client is not None:
+            response = client.get(path)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            return response.status_code, response.get('X-Cache', '-')
+        try:
+            request = urllib.request.Request(base_url.rstrip('/') + path, headers=headers)
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                return response.status, response.headers.get('X-Cache', '-')
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers.get('X-Cache', '-')
+        except OSError:
+            return 'error', '-'
+
+    def report(self, path, base_url, results, elapsed, concurrency, queries, asgi=False):
+        latencies = sorted(latency * 1000 for latency, _, _ in results)
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+
+        if base_url is None:
+            handler = 'ASGI' if asgi else 'WSGI'
+            view = resolve(path.split('?')[0]).func.view_class.__name__
+            target = f"in-process {handler} ({view}) {path}"
+        else:
+            target = f"{base_url} {path}"
+        self.stdout.write(f"{'target':<14}{target}")
+        self.stdout.write(f"{'requests':<14}{len(results)} with {concurrency} workers in {elapsed:.2f}s")
+        self.stdout.write(f"{'throughput':<14}{len(results) / elapsed:.1f} req/s")
+        self.stdout.write(
+            f"{'latency ms':<14}p50 {quantiles[49]:.1f}  p95 {quantiles[94]:.1f}  "
+            f"p99 {quantiles[98]:.1f}  max {latencies[-1]:.1f}"
+        )
+        statuses = Counter(status for _, status, _ in results)
+        self.stdout.write(f"{'status':<14}{dict(sorted(statuses.items(), key=str))}")
+        cache_results = Counter(cache_result for _, _, cache_result in results)
+        self.stdout.write(f"{'X-Cache':<14}{dict(sorted(cache_results.items()))}")
+        if base_url is None:
+            self.stdout.write(f"{'db queries':<14}{queries['total']} ({queries['count']} COUNT(*))")
+            self.stdout.write(f"{'cache':<14}{response_cache.stats().get('list', {})}")
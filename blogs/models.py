@@ -1,11 +1,24 @@
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Left
 
 from utilities.models import BaseModel
+from utilities.search import build_search_vector, supports_full_text
 
 class Post(BaseModel):
     title = models.CharField(max_length=255, help_text="Enter the title of the post")
     content = models.TextField(help_text="Write the content of the post")
     author = models.ForeignKey('accounts.Account', on_delete=models.CASCADE, related_name="posts")
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+
+    # Title matches rank above content matches
+    search_weights = (('title', 'A'), ('content', 'B'))
+
+    # Fields to_dict() (and blogs.serializers.PostSerializer) return when none are requested
+    default_api_fields = ('id', 'title', 'content', 'author', 'created_at', 'updated_at', 'is_published')
    
     def __str__(self):
         return self.title
@@ -17,19 +30,68 @@ class Post(BaseModel):
         verbose_name_plural = 'Posts'
         indexes = [
             models.Index(fields=['title']), 
+            GinIndex(fields=['search_vector']),
+            # pg_trgm indexes serving icontains / trigram similarity lookups,
+            # the extension is created before migrating (blogs.signals)
+            GinIndex(fields=['title'], name='posts_title_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['content'], name='posts_content_trgm', opclasses=['gin_trgm_ops']),
         ]  
-    def to_dict(self):
-        '''Convert model instance to dictionary'''
-        return {
-            'id': self.id,
-            'title': self.title,
-            'content': self.content,
-            'author': {
+
+    @classmethod
+    def search_vector_expression(cls):
+        """Weighted search vector computed from the stored columns"""
+        return build_search_vector(cls.search_weights)
+
+    @classmethod
+    def excerpt_expression(cls, length):
+        """First ``length`` characters of content, cut in the database"""
+        return Left('content', length)
+
+    def search_vector_value(self):
+        """Search vector of the in-memory values, valid inside an INSERT too (and bulk_create)"""
+        return build_search_vector(
+            (Value(getattr(self, field) or ''), weight)
+            for field, weight in self.search_weights
+        )
+
+    def save(self, *args, **kwargs):
+        """Keep search_vector in sync in the same INSERT/UPDATE"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            # Only rebuild the vector when a searchable field actually changed
+            update_fields = self.get_dirty_fields()
+        searchable = {field for field, _ in self.search_weights}
+        if supports_full_text(kwargs.get('using')) and (
+            update_fields is None or searchable & set(update_fields)
+        ):
+            self.search_vector = self.search_vector_value()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = [*kwargs['update_fields'], 'search_vector']
+
+        super().save(*args, **kwargs)
+
+    def to_dict(self, fields=None):
+        '''Convert model instance to dictionary, limited to ``fields`` if given'''
+        fields = self.default_api_fields if fields is None else fields
+        # Only the requested values are read, others may be deferred
+        values = {
+            'id': lambda: self.id,
+            'title': lambda: self.title,
+            'content': lambda: self.content,
+            'excerpt': self.get_excerpt,
+            'author': lambda: {
                 'id': self.author.id,
                 'username': self.author.username,
-        
             },
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'is_published': getattr(self, 'is_active', True),
-        }    
\ No newline at end of file
+            # Encoded by utilities.json_encoding, which handles datetimes natively
+            'created_at': lambda: self.created_at,
+            'updated_at': lambda: self.updated_at,
+            'is_published': lambda: getattr(self, 'is_active', True),
+        }
+        return {name: value() for name, value in values.items() if name in fields}
+
+    def get_excerpt(self):
+        '''The excerpt annotation, or the excerpt cut from content when not annotated'''
+        if hasattr(self, 'excerpt'):
+            return self.excerpt
+        return self.content[:settings.POST_EXCERPT_LENGTH]
@@ -0,0 +1,20 @@
+from utilities.serializers import ValuesSerializer
+
+from .models import Post
+
+
+class PostSerializer(ValuesSerializer):
+    """Post list rows, with the same keys and values as Post.to_dict()"""
+    fields = {
+        'id': 'id',
+        'title': 'title',
+        'content': 'content',
+        # Annotated by the view from Post.excerpt_expression()
+        'excerpt': 'excerpt',
+        # author__id is read from posts.author_id, only username needs the join
+        'author': {'id': 'author__id', 'username': 'author__username'},
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+        'is_published': 'is_active',
+    }
+    default_fields = Post.default_api_fields
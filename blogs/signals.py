@@ -0,0 +1,32 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blogs.models import Post
+from utilities.response_cache import response_cache
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post(sender, instance, **kwargs):
+    """
+    A created or edited post changes its detail page, its author's lists and
+    the global lists (invalidated when the saving transaction commits)
+    """
+    response_cache.invalidate_post(instance.pk, instance.author_id)
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post(sender, instance, **kwargs):
+    response_cache.invalidate_post(instance.pk, instance.author_id)
+
+
+def create_trigram_extension(sender, using, **kwargs):
+    """
+    Enable pg_trgm before migrations run, so the posts table's gin_trgm_ops
+    indexes can be created by whatever initial migration the deployment has.
+    Connected to pre_migrate in BlogsConfig.ready().
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
@@ -1,18 +1,36 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
+    AsyncPostDetailView,
+    AsyncPostListView,
+    AsyncUserPostsView,
     PostListView,
     PostCreateView,
     PostDetailView,
     PostUpdateView,
     PostDeleteView,
     UserPostsView,
+    PostBulkImportView,
+    PostExportView,
+    PostBulkUpdateView,
+    PostBulkDeleteView,
 )
 
+if settings.ASYNC_VIEWS:
+    # Native async read views when served through ASGI, see core/asgi.py
+    post_list_view, user_posts_view, post_detail_view = AsyncPostListView, AsyncUserPostsView, AsyncPostDetailView
+else:
+    post_list_view, user_posts_view, post_detail_view = PostListView, UserPostsView, PostDetailView
+
 urlpatterns = [
-    path("posts/", PostListView.as_view(), name="post-list"),
-    path("posts/my-posts/", UserPostsView.as_view(), name="user-posts"),
+    path("posts/", post_list_view.as_view(), name="post-list"),
+    path("posts/my-posts/", user_posts_view.as_view(), name="user-posts"),
     path("posts/create/", PostCreateView.as_view(), name="post-create"),
-    path("posts/<int:post_id>/", PostDetailView.as_view(), name="post-detail"),
+    path("posts/bulk/", PostBulkImportView.as_view(), name="post-bulk-import"),
+    path("posts/export/", PostExportView.as_view(), name="post-export"),
+    path("posts/bulk/update/", PostBulkUpdateView.as_view(), name="post-bulk-update"),
+    path("posts/bulk/delete/", PostBulkDeleteView.as_view(), name="post-bulk-delete"),
+    path("posts/<int:post_id>/", post_detail_view.as_view(), name="post-detail"),
     path("posts/<int:post_id>/update/", PostUpdateView.as_view(), name="post-update"),
     path("posts/<int:post_id>/delete/", PostDeleteView.as_view(), name="post-delete"),
 ]
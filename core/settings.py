@@ -72,12 +72,14 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "accounts",
     "blogs",
     "corsheaders",
 ]
 
 MIDDLEWARE = [
+    "utilities.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -143,6 +145,24 @@ MEDIA_ROOT = BASE_DIR / "media"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "accounts.Account"
 
+# Log files rotate at LOG_MAX_BYTES or every LOG_ROTATE_INTERVAL seconds
+# (86400: midnight UTC; 0 disables either), keeping LOG_BACKUP_COUNT gzip
+# compressed backups. With LOG_FILE_PER_PROCESS every process writes its own
+# <name>.<pid>.log, as rotating a file shared by several workers is unsafe.
+# Records are written by a background thread from a queue of LOG_QUEUE_SIZE
+# records; when it is full the "drop" policy discards new records and "block"
+# waits up to LOG_QUEUE_BLOCK_TIMEOUT seconds first.
+LOG_FILE = config("LOG_FILE", default="debug.log")
+REQUEST_LOG_FILE = config("REQUEST_LOG_FILE", default="requests.log")
+LOG_MAX_BYTES = config("LOG_MAX_BYTES", default=10 * 1024 * 1024, cast=int)
+LOG_ROTATE_INTERVAL = config("LOG_ROTATE_INTERVAL", default=86400, cast=int)
+LOG_BACKUP_COUNT = config("LOG_BACKUP_COUNT", default=7, cast=int)
+LOG_COMPRESS = config("LOG_COMPRESS", default=True, cast=bool)
+LOG_FILE_PER_PROCESS = config("LOG_FILE_PER_PROCESS", default=True, cast=bool)
+LOG_QUEUE_SIZE = config("LOG_QUEUE_SIZE", default=10000, cast=int)
+LOG_QUEUE_POLICY = config("LOG_QUEUE_POLICY", default="drop")
+LOG_QUEUE_BLOCK_TIMEOUT = config("LOG_QUEUE_BLOCK_TIMEOUT", default=0.05, cast=float)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -151,24 +171,203 @@ LOGGING = {
             "format": "{asctime} {levelname} {message} {lineno} ",
             "style": "{",
         },
+        "json": {
+            "()": "utilities.log_handlers.JSONFormatter",
+        },
     },
     "handlers": {
         "file": {
             "level": "DEBUG",
-            "class": "logging.FileHandler",
-            "filename": "debug.log",
+            "class": "utilities.log_handlers.RotatingFileHandler",
+            "filename": LOG_FILE,
+            "max_bytes": LOG_MAX_BYTES,
+            "interval": LOG_ROTATE_INTERVAL,
+            "backup_count": LOG_BACKUP_COUNT,
+            "compress": LOG_COMPRESS,
+            "per_process": LOG_FILE_PER_PROCESS,
             "formatter": "timestamp",
         },
+        # Request log lines (RequestLoggingMiddleware) as JSON records
+        "request_file": {
+            "level": "DEBUG",
+            "class": "utilities.log_handlers.RotatingFileHandler",
+            "filename": REQUEST_LOG_FILE,
+            "max_bytes": LOG_MAX_BYTES,
+            "interval": LOG_ROTATE_INTERVAL,
+            "backup_count": LOG_BACKUP_COUNT,
+            "compress": LOG_COMPRESS,
+            "per_process": LOG_FILE_PER_PROCESS,
+            "formatter": "json",
+        },
+        # Loggers write to these, the files are written by their listener threads
+        "queue": {
+            "()": "utilities.log_handlers.BoundedQueueHandler",
+            "targets": ["file"],
+            "queue_size": LOG_QUEUE_SIZE,
+            "policy": LOG_QUEUE_POLICY,
+            "block_timeout": LOG_QUEUE_BLOCK_TIMEOUT,
+        },
+        "request_queue": {
+            "()": "utilities.log_handlers.BoundedQueueHandler",
+            "targets": ["request_file"],
+            "queue_size": LOG_QUEUE_SIZE,
+            "policy": LOG_QUEUE_POLICY,
+            "block_timeout": LOG_QUEUE_BLOCK_TIMEOUT,
+        },
     },
     "loggers": {
         "django": {
-            "handlers": ["file"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": True,
         },
+        "utilities.middleware": {
+            "handlers": ["request_queue"],
+            "level": "DEBUG",
+            "propagate": False,
+        },
+        # Slow query warnings (DB_SLOW_QUERY_MS)
+        "utilities.instrumentation": {
+            "handlers": ["request_queue"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
 JWT_SECRET_KEY = config("JWT_SECRET_KEY", default="your-jwt-secret")
-JWT_ALGORITHM = "HS256"
+# HS256 signs with JWT_SECRET_KEY. RS256/EdDSA sign with the active key of the
+# key set in JWT_KEYSET_FILE (see the rotate_jwt_keys command); every key in
+# the set, selected by the token's "kid" header, is accepted for verification.
+JWT_ALGORITHM = config("JWT_ALGORITHM", default="HS256")
+JWT_KEYSET_FILE = config("JWT_KEYSET_FILE", default="")
 JWT_EXPIRATION_DELTA = timedelta(hours=1)
+JWT_REFRESH_EXPIRATION_DELTA = timedelta(
+    days=config("JWT_REFRESH_EXPIRATION_DAYS", default=14, cast=int)
+)
+# Revoked access tokens: each worker checks the revoked_tokens table for new rows
+# (and so picks up revocations by other workers) every this many seconds
+JWT_REVOCATION_SYNC_INTERVAL = config("JWT_REVOCATION_SYNC_INTERVAL", default=5, cast=int)
+JWT_REVOCATION_BLOOM_CAPACITY = config("JWT_REVOCATION_BLOOM_CAPACITY", default=100000, cast=int)
+# "minimal" (user_id, username) or "snapshot" (adds is_staff/is_active so
+# read-only endpoints authenticate without querying the account; needs a
+# shared CACHES backend, see JWT_USER_CACHE_ALIAS)
+JWT_CLAIM_PROFILE = config("JWT_CLAIM_PROFILE", default="minimal")
+
+# Pagination totals: "exact", "cached" (COUNT(*) cached per filter) or
+# "estimate" (PostgreSQL planner estimate above the threshold, exact below it)
+PAGINATION_COUNT_STRATEGY = config("PAGINATION_COUNT_STRATEGY", default="cached")
+PAGINATION_COUNT_CACHE_TIMEOUT = config("PAGINATION_COUNT_CACHE_TIMEOUT", default=60, cast=int)
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = config(
+    "PAGINATION_COUNT_ESTIMATE_THRESHOLD", default=100000, cast=int
+)
+
+# PostgreSQL text search configuration used for Post.search_vector and queries
+SEARCH_CONFIG = config("SEARCH_CONFIG", default="english")
+# Minimum pg_trgm word similarity for typo-tolerant ("~" prefixed) search fields
+SEARCH_TRIGRAM_THRESHOLD = config("SEARCH_TRIGRAM_THRESHOLD", default=0.6, cast=float)
+
+# Authenticated-user cache for JWT lookups (utilities.user_cache)
+JWT_USER_CACHE_SIZE = config("JWT_USER_CACHE_SIZE", default=1024, cast=int)
+# Per-process tier: also the longest another worker may serve a changed account
+JWT_USER_CACHE_LOCAL_TIMEOUT = config("JWT_USER_CACHE_LOCAL_TIMEOUT", default=30, cast=int)
+# Shared tier (Django cache alias, empty to disable); capped by the token's exp.
+# Only used when the alias is a shared CACHES backend (not local memory)
+JWT_USER_CACHE_ALIAS = config("JWT_USER_CACHE_ALIAS", default="default")
+JWT_USER_CACHE_TIMEOUT = config("JWT_USER_CACHE_TIMEOUT", default=300, cast=int)
+
+# Login throttling ("<count>/<period>", period s/min/hour/day), token buckets in
+# the default cache: every attempt per client IP, failed logins per username
+# (roomier, as anyone can spend it on someone else's account)
+LOGIN_THROTTLE_IP_RATE = config("LOGIN_THROTTLE_IP_RATE", default="30/min")
+LOGIN_THROTTLE_USERNAME_RATE = config("LOGIN_THROTTLE_USERNAME_RATE", default="10/min")
+# Client IP behind reverse proxies: header set by the proxies (e.g.
+# "X-Forwarded-For", empty to use REMOTE_ADDR) and how many of them are in
+# front of the app; the address is that many entries from the right
+CLIENT_IP_HEADER = config("CLIENT_IP_HEADER", default="")
+CLIENT_IP_PROXY_COUNT = config("CLIENT_IP_PROXY_COUNT", default=1, cast=int)
+# Password hashing runs on a bounded pool: WORKERS hashes at once, QUEUE_SIZE
+# more waiting, anything beyond that (or waiting over TIMEOUT seconds) gets a 429
+LOGIN_PASSWORD_WORKERS = config("LOGIN_PASSWORD_WORKERS", default=4, cast=int)
+LOGIN_PASSWORD_QUEUE_SIZE = config("LOGIN_PASSWORD_QUEUE_SIZE", default=16, cast=int)
+LOGIN_PASSWORD_TIMEOUT = config("LOGIN_PASSWORD_TIMEOUT", default=10, cast=int)
+
+# BaseModel.save validation: "full" (full_clean, with a query per unique and
+# foreign key check), "fields" (field values and clean() only, uniqueness left to
+# the database) or "none"; override per call with save(validation=...)
+MODEL_VALIDATION_MODE = config("MODEL_VALIDATION_MODE", default="fields")
+
+# Bulk post import (rows per bulk_create/transaction, ?chunk_size= is capped at
+# the maximum) and streaming export (rows fetched per database round trip)
+POST_BULK_CHUNK_SIZE = config("POST_BULK_CHUNK_SIZE", default=500, cast=int)
+POST_BULK_MAX_CHUNK_SIZE = config("POST_BULK_MAX_CHUNK_SIZE", default=5000, cast=int)
+POST_EXPORT_CHUNK_SIZE = config("POST_EXPORT_CHUNK_SIZE", default=2000, cast=int)
+# Most posts one bulk update/delete may select (ids or filter matches)
+POST_BULK_MAX_ROWS = config("POST_BULK_MAX_ROWS", default=50000, cast=int)
+
+# Characters in the "excerpt" field of post lists (?fields=...,excerpt),
+# ?excerpt_length= is capped at the maximum
+POST_EXCERPT_LENGTH = config("POST_EXCERPT_LENGTH", default=200, cast=int)
+POST_EXCERPT_MAX_LENGTH = config("POST_EXCERPT_MAX_LENGTH", default=2000, cast=int)
+
+# Server-side cache of public post list/detail responses: "locmem" (per
+# process), "file" (RESPONSE_CACHE_LOCATION directory, per host), "django"
+# (RESPONSE_CACHE_LOCATION cache alias, shared only with a shared CACHES
+# backend) or a dotted backend path; empty disables it
+RESPONSE_CACHE_BACKEND = config("RESPONSE_CACHE_BACKEND", default="django")
+RESPONSE_CACHE_LOCATION = config("RESPONSE_CACHE_LOCATION", default="")
+RESPONSE_CACHE_TIMEOUT = config("RESPONSE_CACHE_TIMEOUT", default=60, cast=int)
+RESPONSE_CACHE_MAX_ENTRIES = config("RESPONSE_CACHE_MAX_ENTRIES", default=1024, cast=int)
+# Stampede protection: one request rebuilds an expired entry while the others
+# get the previous one for up to STALE_TTL seconds past expiry, or wait up to
+# LOCK_WAIT seconds for the rebuild (the lock is dropped after LOCK_TIMEOUT).
+# Entries are refreshed early with a probability scaled by EARLY_EXPIRY_BETA
+# (0 disables)
+RESPONSE_CACHE_STALE_TTL = config("RESPONSE_CACHE_STALE_TTL", default=30, cast=int)
+RESPONSE_CACHE_LOCK_TIMEOUT = config("RESPONSE_CACHE_LOCK_TIMEOUT", default=10, cast=int)
+RESPONSE_CACHE_LOCK_WAIT = config("RESPONSE_CACHE_LOCK_WAIT", default=2.0, cast=float)
+RESPONSE_CACHE_EARLY_EXPIRY_BETA = config("RESPONSE_CACHE_EARLY_EXPIRY_BETA", default=1.0, cast=float)
+
+# JSON encoder for API responses: "auto" (orjson when installed, else the
+# standard library), "orjson", "stdlib" or a dotted path to an encoder class
+JSON_ENCODER = config("JSON_ENCODER", default="auto")
+
+# Post list pages of at least LIST_STREAMING_MIN_PAGE_SIZE posts (0 disables)
+# are streamed: rows are read LIST_STREAMING_CHUNK_SIZE at a time from a
+# server-side cursor and written out in chunks of about
+# JSON_STREAMING_BUFFER_SIZE bytes. Streamed pages skip the response cache.
+LIST_STREAMING_MIN_PAGE_SIZE = config("LIST_STREAMING_MIN_PAGE_SIZE", default=50, cast=int)
+LIST_STREAMING_CHUNK_SIZE = config("LIST_STREAMING_CHUNK_SIZE", default=20, cast=int)
+JSON_STREAMING_BUFFER_SIZE = config("JSON_STREAMING_BUFFER_SIZE", default=16384, cast=int)
+
+# Route the post list, user posts and detail endpoints to their native async
+# views. Off by default, also under ASGI: on short local queries they measured
+# slower than the sync views. Never turn it on under WSGI, where every async
+# view would run in its own event loop.
+ASYNC_VIEWS = config("ASYNC_VIEWS", default=False, cast=bool)
+
+# Request log lines (utilities.middleware.RequestLoggingMiddleware): level of
+# the lines ("OFF" disables them) and share of requests logged. Server errors
+# and requests slower than REQUEST_LOG_SLOW_MS (0 disables) are always logged
+# at WARNING.
+REQUEST_LOG_LEVEL = config("REQUEST_LOG_LEVEL", default="INFO")
+REQUEST_LOG_SAMPLE_RATE = config("REQUEST_LOG_SAMPLE_RATE", default=1.0, cast=float)
+REQUEST_LOG_SLOW_MS = config("REQUEST_LOG_SLOW_MS", default=1000, cast=int)
+
+# Database instrumentation (utilities/instrumentation.py): request log records
+# carry the request's query count, database time and its DB_SLOWEST_QUERIES
+# slowest statements; queries taking DB_SLOW_QUERY_MS or more (0 disables) are
+# logged with their normalized SQL. SERVER_TIMING adds the database and total
+# times to a Server-Timing response header (visible to clients, on with DEBUG).
+DB_SLOWEST_QUERIES = config("DB_SLOWEST_QUERIES", default=3, cast=int)
+DB_SLOW_QUERY_MS = config("DB_SLOW_QUERY_MS", default=200, cast=int)
+SERVER_TIMING = config("SERVER_TIMING", default=DEBUG, cast=bool)
+
+# Prometheus metrics on /metrics. Under a multi-process server (gunicorn
+# workers) set METRICS_MULTIPROC_DIR to a directory shared by the workers and
+# emptied when the server starts: each worker writes its metrics there every
+# METRICS_WRITE_INTERVAL seconds and scrapes merge them. Scrapes must send
+# METRICS_TOKEN as a bearer token; without it /metrics answers 403 unless DEBUG.
+METRICS_MULTIPROC_DIR = config("METRICS_MULTIPROC_DIR", default="")
+METRICS_WRITE_INTERVAL = config("METRICS_WRITE_INTERVAL", default=1.0, cast=float)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
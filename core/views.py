@@ -0,0 +1,26 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+
+from utilities.metrics import export
+
+
+class MetricsView(View):
+    """
+    Prometheus scrape endpoint: every registered metric in the text
+    exposition format, merged over the worker processes with
+    METRICS_MULTIPROC_DIR. Scrapes must send METRICS_TOKEN as a bearer
+    token; without one the endpoint is only open with DEBUG.
+    """
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def get(self, request):
+        if not settings.METRICS_TOKEN and not settings.DEBUG:
+            return JsonResponse({'error': 'Metrics are disabled, set METRICS_TOKEN'}, status=403)
+        if settings.METRICS_TOKEN:
+            scheme, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+            if scheme != 'Bearer' or not hmac.compare_digest(token.strip(), settings.METRICS_TOKEN):
+                return JsonResponse({'error': 'Invalid metrics token'}, status=401)
+        return HttpResponse(export(), content_type=self.content_type)
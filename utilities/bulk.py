@@ -0,0 +1,43 @@
+# utilities/bulk.py
+from django.db import connections
+from django.db.models import F, Lookup, Q
+
+
+class AnyOf(Lookup):
+    """
+    ``field = ANY(%s)`` with the whole list bound as one array parameter.
+
+    ``__in`` expands to one placeholder per value, so very large id lists hit
+    driver parameter limits and bloat the statement; an array stays a single
+    parameter however many ids it holds.
+    """
+    lookup_name = 'any_of'
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} = ANY({rhs})', [*lhs_params, *rhs_params]
+
+
+def filter_in(queryset, field, values):
+    """Filter ``field`` to values, as a single array parameter on PostgreSQL"""
+    values = list(values)
+    if connections[queryset.db].vendor == 'postgresql':
+        return queryset.filter(Q(AnyOf(F(field), values)))
+    return queryset.filter(**{f'{field}__in': values})
+
+
+def parse_ids(raw_ids):
+    """Validate a list of integer ids from a request body, dropping duplicates (order kept)"""
+    if not isinstance(raw_ids, list):
+        raise ValueError('ids must be a list of integers')
+    ids = []
+    seen = set()
+    for raw_id in raw_ids:
+        if isinstance(raw_id, bool) or not isinstance(raw_id, int):
+            raise ValueError('ids must be a list of integers')
+        if raw_id not in seen:
+            seen.add(raw_id)
+            ids.append(raw_id)
+    return ids
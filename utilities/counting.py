@@ -0,0 +1,155 @@
+# utilities/counting.py
+import hashlib
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+EXACT = 'exact'
+CACHED = 'cached'
+ESTIMATE = 'estimate'
+
+STRATEGIES = (EXACT, CACHED, ESTIMATE)
+
+
+class QueryCounter:
+    """
+    Count rows of a queryset with a configurable strategy.
+
+    * ``exact``    - always run ``COUNT(*)``.
+    * ``cached``   - ``COUNT(*)`` cached per normalized filter for ``timeout`` seconds.
+    * ``estimate`` - like ``cached``, but on a cache miss ask the PostgreSQL planner
+      first and only run ``COUNT(*)`` when the estimate is below ``estimate_threshold``.
+
+    ``count()`` returns ``(value, strategy)`` where strategy tells which path
+    produced the number: ``exact``, ``cached`` or ``estimate``.
+    """
+
+    def __init__(self, strategy=None, timeout=None, estimate_threshold=None, cache_alias=None):
+        self.strategy = strategy or getattr(settings, 'PAGINATION_COUNT_STRATEGY', CACHED)
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f'Unknown count strategy "{self.strategy}"')
+        self.timeout = timeout if timeout is not None else getattr(
+            settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 60
+        )
+        self.estimate_threshold = estimate_threshold if estimate_threshold is not None else getattr(
+            settings, 'PAGINATION_COUNT_ESTIMATE_THRESHOLD', 100000
+        )
+        self.cache_alias = cache_alias or getattr(settings, 'PAGINATION_COUNT_CACHE_ALIAS', 'default')
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def count(self, queryset):
+        """Return (count, strategy) for the queryset"""
+        queryset = self.normalize(queryset)
+
+        if self.strategy == EXACT:
+            return queryset.count(), EXACT
+
+        key = self.cache_key(queryset)
+        cached = self.cache.get(key)
+        if cached is not None:
+            value, source = cached
+            return value, ESTIMATE if source == ESTIMATE else CACHED
+
+        value, source = None, EXACT
+        if self.strategy == ESTIMATE:
+            estimate = self.planner_estimate(queryset)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                value, source = estimate, ESTIMATE
+
+        if value is None:
+            value = queryset.count()
+
+        self.cache.set(key, (value, source), self.timeout)
+        return value, source
+
+    async def acount(self, queryset):
+        """count() for async views: the cache and the ORM are used through their async APIs"""
+        queryset = self.normalize(queryset)
+
+        if self.strategy == EXACT:
+            return await queryset.acount(), EXACT
+
+        key = self.cache_key(queryset)
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            value, source = cached
+            return value, ESTIMATE if source == ESTIMATE else CACHED
+
+        value, source = None, EXACT
+        if self.strategy == ESTIMATE:
+            estimate = await sync_to_async(self.planner_estimate)(queryset)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                value, source = estimate, ESTIMATE
+
+        if value is None:
+            value = await queryset.acount()
+
+        await self.cache.aset(key, (value, source), self.timeout)
+        return value, source
+
+    def normalize(self, queryset):
+        """Drop ordering and joins that don't change the number of rows"""
+        if queryset._fields is not None:
+            # values() rows: the same count whichever columns were selected
+            return queryset.order_by().values('pk')
+        return queryset.order_by().select_related(None)
+
+    def cache_key(self, queryset):
+        """Cache key derived from the filter SQL, independent of ordering and page"""
+        sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+        digest = hashlib.sha256(
+            f'{sql}|{json.dumps(params, default=str)}'.encode('utf-8')
+        ).hexdigest()
+        return f'count:{queryset.model._meta.label_lower}:{digest}'
+
+    def planner_estimate(self, queryset):
+        """Row estimate from PostgreSQL's planner, or None when unavailable"""
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+        except Exception as e:
+            logger.warning(f"Planner count estimate failed: {e}")
+            return None
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CountingPaginator(Paginator):
+    """
+    Paginator that delegates its count to a QueryCounter.
+
+    Pass ``count`` as the ``(value, strategy)`` pair of a count already
+    made, e.g. by ``QueryCounter.acount()`` in async views.
+    """
+
+    def __init__(self, object_list, per_page, counter=None, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.counter = counter or QueryCounter()
+        self.count_strategy = None
+        if count is not None:
+            self.__dict__['count'], self.count_strategy = count
+
+    @cached_property
+    def count(self):
+        value, self.count_strategy = self.counter.count(self.object_list)
+        return value
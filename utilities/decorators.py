@@ -1,78 +1,66 @@
 # utilities/decorators.py
 from functools import wraps
-from django.http import JsonResponse
+
+from asgiref.sync import iscoroutinefunction
 from django.utils.decorators import method_decorator
-from utilities.jwt_utils import verify_jwt, decode_jwt_token
+from utilities.jwt_utils import aauthenticate_request, authenticate_request
+
+# All variants share authenticate_request: the token is verified once and the
+# user is loaded lazily the first time the view reads request.user. Async
+# views (async def) get an async wrapper going through aauthenticate_request,
+# so Django still sees them as async.
 
 def jwt_required_func(view_func):
     """Decorator for function-based views"""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapped_view(request, *args, **kwargs):
+            error_response = await aauthenticate_request(request)
+            if error_response:
+                return error_response
+
+            return await view_func(request, *args, **kwargs)
+
+        return async_wrapped_view
+
     @wraps(view_func)
     def wrapped_view(request, *args, **kwargs):
-        payload, error_response = verify_jwt(request)
+        error_response = authenticate_request(request)
         if error_response:
             return error_response
-        
-        try:
-            auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-                user = decode_jwt_token(token)
-                request.user = user
-            else:
-                return JsonResponse({'error': 'Invalid authorization header'}, status=401)
-        except Exception as e:
-            return JsonResponse({'error': str(e)}, status=401)
-        
+
         return view_func(request, *args, **kwargs)
-    
+
     return wrapped_view
 
 def jwt_required_class(view_func):
     """Decorator for class-based views - direct usage"""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapped_view(self, request, *args, **kwargs):
+            error_response = await aauthenticate_request(request)
+            if error_response:
+                return error_response
+
+            return await view_func(self, request, *args, **kwargs)
+
+        return async_wrapped_view
+
     @wraps(view_func)
     def wrapped_view(self, request, *args, **kwargs):
-        payload, error_response = verify_jwt(request)
+        error_response = authenticate_request(request)
         if error_response:
             return error_response
-        
-        try:
-            auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-                user = decode_jwt_token(token)
-                request.user = user
-            else:
-                return JsonResponse({'error': 'Invalid authorization header'}, status=401)
-        except Exception as e:
-            return JsonResponse({'error': str(e)}, status=401)
-        
+
         return view_func(self, request, *args, **kwargs)
-    
+
     return wrapped_view
 
 def jwt_required_method(view_func):
     """Decorator for use with method_decorator"""
-    @wraps(view_func)
-    def wrapped_view(request, *args, **kwargs):
-        payload, error_response = verify_jwt(request)
-        if error_response:
-            return error_response
-        
-        try:
-            auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-                user = decode_jwt_token(token)
-                request.user = user
-            else:
-                return JsonResponse({'error': 'Invalid authorization header'}, status=401)
-        except Exception as e:
-            return JsonResponse({'error': str(e)}, status=401)
-        
-        return view_func(request, *args, **kwargs)
-    
-    return wrapped_view
+    # Same request-first signature as a function-based view
+    return jwt_required_func(view_func)
 
 # Aliases for convenience
 jwt_required = jwt_required_class  # For direct usage on methods
-jwt_required_for_method_decorator = jwt_required_method  # For use with @method_decorator
\ No newline at end of file
+jwt_required_for_method_decorator = jwt_required_method  # For use with @method_decorator
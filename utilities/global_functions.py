@@ -1,3 +1,4 @@
+import os
 import uuid
 from typing import Dict
 import re
@@ -5,11 +6,30 @@ import re
 
 from datetime import datetime
 
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
 
 def generate_uuid():
     return uuid.uuid4().hex
 
 
+def is_shared_cache(cache):
+    """Whether entries in cache are seen by the other worker processes (not local memory or dummy)"""
+    return not isinstance(cache, (LocMemCache, DummyCache))
+
+
+def is_pid_alive(pid):
+    """Whether a process with this pid runs (possibly under another user)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
 # def model_validation(
 #     model_name: object, error_msg: str, filter_query: Dict[str, any]
 # ) -> any:
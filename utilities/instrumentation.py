@@ -0,0 +1,194 @@
+# utilities/instrumentation.py
+import hashlib
+import heapq
+import logging
+import re
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """Database work done while handling one request"""
+    __slots__ = ('query_count', 'db_time_ns', 'slowest')
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time_ns = 0
+        # Min-heap of (duration_ns, sql) holding the DB_SLOWEST_QUERIES slowest statements
+        self.slowest = []
+
+    def add_query(self, sql, duration_ns, keep):
+        self.query_count += 1
+        self.db_time_ns += duration_ns
+        if len(self.slowest) < keep:
+            heapq.heappush(self.slowest, (duration_ns, sql))
+        elif keep and duration_ns > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (duration_ns, sql))
+
+    def get_slowest(self):
+        """The slowest statements, slowest first, as {"sql": fingerprint, "duration_ms": ...}"""
+        return [
+            {'sql': fingerprint(sql), 'duration_ms': round(duration_ns / 1e6, 3)}
+            for duration_ns, sql in sorted(self.slowest, reverse=True)
+        ]
+
+
+# Stats of the request being handled. A mutable object rather than a counter
+# in the variable itself, so queries run by sync_to_async worker threads (on
+# a copy of the context) add to the same stats.
+_request_stats = ContextVar('request_stats', default=None)
+
+
+def start_request():
+    """
+    Start collecting stats for the current request; returns (stats, token
+    for end_request). Middleware nested in one that already started share
+    its stats.
+    """
+    stats = _request_stats.get()
+    if stats is not None:
+        return stats, None
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def end_request(token):
+    if token is not None:
+        _request_stats.reset(token)
+
+
+def get_request_stats():
+    """Stats of the current request, None outside of one"""
+    return _request_stats.get()
+
+
+class _StreamingContent:
+    """
+    Wraps a streaming response's content so the chunks are produced with the
+    request's stats current (the view has returned and reset them by then)
+    and calls on_complete once, when the content is exhausted or closed.
+    """
+
+    def __init__(self, content, stats, on_complete):
+        self.content = content
+        self.stats = stats
+        self.on_complete = on_complete
+        self.completed = False
+
+    def close(self):
+        # Registered as a resource closer, so also called when the client
+        # goes away before the end (response.close())
+        if not self.completed:
+            self.completed = True
+            self.on_complete()
+
+
+class _SyncStreamingContent(_StreamingContent):
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        token = _request_stats.set(self.stats)
+        try:
+            return next(self.content)
+        except BaseException:
+            self.close()
+            raise
+        finally:
+            _request_stats.reset(token)
+
+
+class _AsyncStreamingContent(_StreamingContent):
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        token = _request_stats.set(self.stats)
+        try:
+            return await anext(self.content)
+        except BaseException:
+            self.close()
+            raise
+        finally:
+            _request_stats.reset(token)
+
+
+def on_response_complete(response, stats, callback):
+    """
+    Call callback() once response is complete: right away, or for streaming
+    responses once their content has been sent, so the queries run while
+    streaming are in stats.
+    """
+    if not response.streaming:
+        callback()
+        return
+    wrapper = _AsyncStreamingContent if response.is_async else _SyncStreamingContent
+    response.streaming_content = wrapper(response.streaming_content, stats, callback)
+
+
+_FINGERPRINT_SUBSTITUTIONS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),                 # string literals
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),              # numbers (not digits inside names)
+    (re.compile(r'%s|\$\d+'), '?'),                       # placeholders
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(?+)'),  # IN lists of any length
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def fingerprint(sql):
+    """SQL with literals and placeholders replaced, so the same statement groups together whatever its values"""
+    for pattern, replacement in _FINGERPRINT_SUBSTITUTIONS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def record_queries(execute, sql, params, many, context):
+    """
+    Database execute wrapper timing each query: adds it to the current
+    request's stats and logs the statement's fingerprint when it takes
+    DB_SLOW_QUERY_MS or more.
+    """
+    started = time.perf_counter_ns()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ns = time.perf_counter_ns() - started
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.add_query(sql, duration_ns, settings.DB_SLOWEST_QUERIES)
+        slow_ms = settings.DB_SLOW_QUERY_MS
+        if slow_ms and duration_ns >= slow_ms * 1_000_000:
+            log_slow_query(sql, duration_ns, context['connection'].alias)
+
+
+def log_slow_query(sql, duration_ns, alias):
+    statement = fingerprint(sql)
+    logger.warning(
+        'Slow query (%.2fms on %s): %s', duration_ns / 1e6, alias, statement,
+        extra={
+            'fingerprint': statement,
+            # Short stable id to group the fingerprint's occurrences by
+            'fingerprint_id': hashlib.sha1(statement.encode()).hexdigest()[:12],
+            'duration_ms': round(duration_ns / 1e6, 3),
+            'database': alias,
+        },
+    )
+
+
+def install_execute_wrapper(connection, **kwargs):
+    # First in the list: connection.execute_wrapper() pops the last one on exit
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_queries)
+
+
+# Connections are per thread and opened lazily, so the wrapper goes on each
+# one as it connects, plus those already open when this module is imported
+connection_created.connect(install_execute_wrapper)
+for _connection in connections.all(initialized_only=True):
+    install_execute_wrapper(_connection)
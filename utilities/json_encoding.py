@@ -0,0 +1,166 @@
+# utilities/json_encoding.py
+import datetime
+import json
+from collections.abc import AsyncIterator, Iterator
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+try:
+    import orjson
+except ImportError:  # optional, see JSON_ENCODER
+    orjson = None
+
+
+class CompatJSONEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder writing datetimes/times as plain ``isoformat()``.
+
+    DjangoJSONEncoder trims microseconds to milliseconds and writes UTC as
+    ``Z``; orjson keeps both, so this keeps the two encoders' output identical.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class StdlibEncoder:
+    """The standard library json module (always available)"""
+    name = 'stdlib'
+    # (item, key) separators dumps() writes, used by iterdumps()
+    separators = (b', ', b': ')
+
+    def dumps(self, data):
+        return json.dumps(data, cls=CompatJSONEncoder).encode('utf-8')
+
+
+class OrjsonEncoder:
+    """
+    orjson: serializes dicts, lists, str, int, float, datetime, date, UUID and
+    dataclasses natively in C; anything else (Decimal, lazy translation
+    strings) goes through CompatJSONEncoder.default.
+    """
+    name = 'orjson'
+    separators = (b',', b':')
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('JSON_ENCODER = "orjson" requires the orjson package')
+        self._fallback = CompatJSONEncoder()
+
+    def dumps(self, data):
+        return orjson.dumps(data, default=self._fallback.default, option=orjson.OPT_NON_STR_KEYS)
+
+
+JSON_ENCODERS = {
+    'stdlib': StdlibEncoder,
+    'orjson': OrjsonEncoder,
+}
+
+_encoder = None
+
+
+def get_encoder():
+    """Encoder selected by settings.JSON_ENCODER ("auto", "orjson", "stdlib" or a dotted path)"""
+    global _encoder
+    if _encoder is None:
+        name = getattr(settings, 'JSON_ENCODER', 'auto')
+        if name == 'auto':
+            name = 'orjson' if orjson is not None else 'stdlib'
+        _encoder = (JSON_ENCODERS.get(name) or import_string(name))()
+    return _encoder
+
+
+def dumps(data):
+    """Encode data to JSON bytes with the configured encoder"""
+    return get_encoder().dumps(data)
+
+
+class JSONStreamWriter:
+    """
+    Buffer shared by iterdumps() and aiterdumps().
+
+    ``values(data)`` writes the keys and plain values of data and yields the
+    iterator values, opening and closing their arrays around them; items
+    go through ``write_item()``, which returns a chunk once about
+    ``buffer_size`` bytes are buffered.
+    """
+
+    def __init__(self, buffer_size=None):
+        if buffer_size is None:
+            buffer_size = getattr(settings, 'JSON_STREAMING_BUFFER_SIZE', 16384)
+        self.buffer_size = buffer_size
+        self.encoder = get_encoder()
+        self.item_separator, self.key_separator = getattr(self.encoder, 'separators', (b',', b':'))
+        self.buffer = bytearray()
+        self.first_item = True
+
+    def values(self, data):
+        self.buffer += b'{'
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                self.buffer += self.item_separator
+            self.buffer += self.encoder.dumps(str(key))
+            self.buffer += self.key_separator
+            if not isinstance(value, (Iterator, AsyncIterator)):
+                self.buffer += self.encoder.dumps(value)
+                continue
+            self.buffer += b'['
+            self.first_item = True
+            yield value
+            self.buffer += b']'
+        self.buffer += b'}'
+
+    def write_item(self, item):
+        if not self.first_item:
+            self.buffer += self.item_separator
+        self.first_item = False
+        self.buffer += self.encoder.dumps(item)
+        if len(self.buffer) >= self.buffer_size:
+            return self.flush()
+        return None
+
+    def flush(self):
+        chunk = bytes(self.buffer)
+        self.buffer.clear()
+        return chunk
+
+
+def iterdumps(data, buffer_size=None):
+    """
+    Encode a dict to JSON bytes chunk by chunk.
+
+    Values that are iterators (e.g. a generator over a queryset iterator) are
+    written as JSON arrays one item at a time, so only the current item is
+    held in memory; everything else is encoded as by ``dumps()``. Output is
+    yielded in chunks of about ``buffer_size`` bytes (default
+    settings.JSON_STREAMING_BUFFER_SIZE) and matches ``dumps()`` of the same
+    data with the iterators as lists.
+    """
+    writer = JSONStreamWriter(buffer_size)
+    for items in writer.values(data):
+        for item in items:
+            chunk = writer.write_item(item)
+            if chunk:
+                yield chunk
+    yield writer.flush()
+
+
+async def aiterdumps(data, buffer_size=None):
+    """iterdumps() as an async generator, also accepting async iterator values"""
+    writer = JSONStreamWriter(buffer_size)
+    for items in writer.values(data):
+        if isinstance(items, AsyncIterator):
+            async for item in items:
+                chunk = writer.write_item(item)
+                if chunk:
+                    yield chunk
+        else:
+            for item in items:
+                chunk = writer.write_item(item)
+                if chunk:
+                    yield chunk
+    yield writer.flush()
@@ -0,0 +1,115 @@
+# utilities/jwt_keys.py
+import json
+import os
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from jwt.algorithms import get_default_algorithms
+
+ASYMMETRIC_ALGORITHMS = ('RS256', 'RS384', 'RS512', 'ES256', 'ES384', 'EdDSA')
+
+
+def is_asymmetric(algorithm):
+    return algorithm in ASYMMETRIC_ALGORITHMS
+
+
+class KeySet:
+    """
+    Signing and verification keys loaded from a JSON key-set file::
+
+        {
+            "active": "<kid used for signing>",
+            "keys": [
+                {"kid": "...", "alg": "RS256", "private_key": "<PEM>",
+                 "public_key": "<PEM>", "created_at": "...", "retired_at": null}
+            ]
+        }
+
+    Every listed key verifies tokens; only ``active`` signs. A file with public
+    keys only is valid for services that just verify. PEM parsing happens once
+    per key: parsed key objects are cached until the file's mtime changes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._active = None
+        self._keys = {}
+
+    def _load(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            raise ImproperlyConfigured(f'JWT key set {self.path} cannot be read: {e}')
+
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            with open(self.path) as keyset_file:
+                data = json.load(keyset_file)
+
+            algorithms = get_default_algorithms()
+            keys = {}
+            for entry in data.get('keys', []):
+                missing = [field for field in ('kid', 'alg', 'public_key') if not entry.get(field)]
+                if missing:
+                    raise ImproperlyConfigured(
+                        f'JWT key set {self.path} has a key without {", ".join(missing)}'
+                    )
+                # Only asymmetric keys belong in a key set (HS256 uses JWT_SECRET_KEY);
+                # the algorithm must also be available (cryptography installed)
+                if entry['alg'] not in ASYMMETRIC_ALGORITHMS or entry['alg'] not in algorithms:
+                    raise ImproperlyConfigured(
+                        f"JWT key set {self.path}: key {entry['kid']} has unsupported alg {entry['alg']!r}, "
+                        f"expected one of {', '.join(a for a in ASYMMETRIC_ALGORITHMS if a in algorithms)}"
+                    )
+                algorithm = algorithms[entry['alg']]
+                keys[entry['kid']] = {
+                    'alg': entry['alg'],
+                    'private': (
+                        algorithm.prepare_key(entry['private_key'])
+                        if entry.get('private_key') else None
+                    ),
+                    'public': algorithm.prepare_key(entry['public_key']),
+                }
+
+            self._keys = keys
+            self._active = data.get('active')
+            self._mtime = mtime
+
+    def signing_key(self):
+        """Return (kid, algorithm, private key) of the active key"""
+        self._load()
+        key = self._keys.get(self._active)
+        if key is None or key['private'] is None:
+            raise ImproperlyConfigured(f'JWT key set {self.path} has no active private key')
+        return self._active, key['alg'], key['private']
+
+    def verification_key(self, kid):
+        """Return (algorithm, public key) for kid, or None if unknown"""
+        self._load()
+        key = self._keys.get(kid)
+        if key is None:
+            return None
+        return key['alg'], key['public']
+
+
+_keysets = {}
+
+
+def get_keyset():
+    """Shared KeySet for settings.JWT_KEYSET_FILE"""
+    path = getattr(settings, 'JWT_KEYSET_FILE', '')
+    if not path:
+        raise ImproperlyConfigured(
+            f'JWT_KEYSET_FILE is required when JWT_ALGORITHM is {settings.JWT_ALGORITHM}'
+        )
+    keyset = _keysets.get(path)
+    if keyset is None:
+        keyset = _keysets.setdefault(path, KeySet(path))
+    return keyset
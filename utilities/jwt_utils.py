@@ -1,72 +1,307 @@
 # utilities/jwt_utils.py
+import uuid
+
 import jwt
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
 from datetime import datetime, timezone
 from django.http import JsonResponse
+from django.utils.functional import SimpleLazyObject
+
+from utilities.jwt_keys import get_keyset, is_asymmetric
+from utilities.metrics import registry
+from utilities.revocation import revocation_list
+from utilities.user_cache import user_cache
 
 User = get_user_model()
 
+
+# Claim profiles (settings.JWT_CLAIM_PROFILE):
+#   minimal  - user_id, username and token version; the account is loaded when used
+#   snapshot - also is_staff/is_active so safe-method requests run on the claims alone
+CLAIM_PROFILE_MINIMAL = 'minimal'
+CLAIM_PROFILE_SNAPSHOT = 'snapshot'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+auth_failures_total = registry.counter(
+    'jwt_auth_failures_total',
+    'Requests refused by bearer token authentication',
+    labelnames=('reason',),
+)
+
+
+class AuthenticationFailed(Exception):
+    """
+    Raised when a request's bearer token is missing or invalid. ``reason``
+    is a short code for metrics: missing_header, invalid, expired, revoked,
+    unknown_user or disabled.
+    """
+
+    def __init__(self, message, reason='invalid'):
+        super().__init__(message)
+        self.reason = reason
+
+
+class ClaimsUser:
+    """
+    Read-only request user built from a snapshot token's claims.
+
+    Exposes the attributes read-only views need (``id``, ``username``,
+    ``is_staff``, ``is_active``) without touching the database. Call
+    ``get_account()`` when the full ``Account`` row is really needed.
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.id = self.pk = payload['user_id']
+        self.username = payload.get('username', '')
+        self.is_staff = bool(payload.get('is_staff', False))
+        self.is_active = bool(payload.get('is_active', True))
+        self.token_version = payload.get('ver')
+
+    def get_account(self):
+        return get_user_from_payload(self.payload)
+
+    def get_username(self):
+        return self.username
+
+    def __eq__(self, other):
+        if isinstance(other, (ClaimsUser, User)):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return self.username
+
+
+def get_claim_profile():
+    return getattr(settings, 'JWT_CLAIM_PROFILE', CLAIM_PROFILE_MINIMAL)
+
 def generate_jwt_token(user):
     """Generate JWT token for user"""
     payload = {
         'user_id': user.id,
         'username': user.username,
+        'ver': user.token_version,
+        'jti': uuid.uuid4().hex,
         'exp': datetime.now(timezone.utc) + settings.JWT_EXPIRATION_DELTA,
         'iat': datetime.now(timezone.utc)
     }
-    token = jwt.encode(
-        payload=payload,
-        key=settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITHM
-    )
-    
+    if get_claim_profile() == CLAIM_PROFILE_SNAPSHOT:
+        payload['is_staff'] = user.is_staff
+        payload['is_active'] = user.is_active
+    if is_asymmetric(settings.JWT_ALGORITHM):
+        kid, algorithm, private_key = get_keyset().signing_key()
+        token = jwt.encode(
+            payload=payload,
+            key=private_key,
+            algorithm=algorithm,
+            headers={'kid': kid}
+        )
+    else:
+        token = jwt.encode(
+            payload=payload,
+            key=settings.JWT_SECRET_KEY,
+            algorithm=settings.JWT_ALGORITHM
+        )
+
     return token
 
-def verify_jwt(request):
-    """Verify JWT token from request"""
+def get_bearer_token(request):
+    """Extract the token from an ``Authorization: Bearer <token>`` header"""
     auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-    
-    if not auth_header.startswith('Bearer '):
-        return None, JsonResponse({'error': 'Invalid authorization header. Format: Bearer <token>'}, status=401)
-    
-    token = auth_header.split(' ')[1]
-    
+    scheme, _, token = auth_header.partition(' ')
+    if scheme != 'Bearer' or not token.strip():
+        raise AuthenticationFailed('Invalid authorization header. Format: Bearer <token>', 'missing_header')
+    return token.strip()
+
+def get_verification_key(token):
+    """Return (key, algorithm) that must have signed the token"""
+    if not is_asymmetric(settings.JWT_ALGORITHM):
+        return settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM
+
+    kid = jwt.get_unverified_header(token).get('kid')
+    verification_key = get_keyset().verification_key(kid) if kid else None
+    if verification_key is None:
+        raise AuthenticationFailed('Invalid token: unknown signing key')
+    algorithm, public_key = verification_key
+    return public_key, algorithm
+
+def decode_token(token):
+    """Verify the token signature and expiry and return its claims"""
     try:
+        key, algorithm = get_verification_key(token)
         payload = jwt.decode(
-            token, 
-            settings.JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
+            token,
+            key,
+            algorithms=[algorithm]
         )
-        return payload, None
     except jwt.ExpiredSignatureError:
-        return None, JsonResponse({'error': 'Token has expired'}, status=401)
+        raise AuthenticationFailed('Token has expired', 'expired')
     except jwt.InvalidTokenError as e:
-        return None, JsonResponse({'error': f'Invalid token: {str(e)}'}, status=401)
-    except Exception as e:
-        return None, JsonResponse({'error': f'Token verification failed: {str(e)}'}, status=401)
+        raise AuthenticationFailed(f'Invalid token: {str(e)}')
+
+    if 'jti' in payload and revocation_list.is_revoked(payload['jti']):
+        raise AuthenticationFailed('Token has been revoked', 'revoked')
+    return payload
+
+def revoke_token(payload):
+    """Revoke an access token (by its verified claims) until it expires"""
+    if 'jti' in payload:
+        revocation_list.revoke(payload['jti'], payload['exp'])
+
+def get_user_from_payload(payload):
+    """Load the account referenced by verified claims, through the user cache"""
+    user_id = payload.get('user_id')
+    if not user_id:
+        raise AuthenticationFailed('User ID not found in token')
+
+    user = user_cache.get(user_id)
+    if user is None:
+        try:
+            user = User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            raise AuthenticationFailed('User not found', 'unknown_user')
+        user_cache.set(user, token_exp=payload.get('exp'))
+        user_cache.set_token_version(user.pk, user.token_version)
+
+    if not user.is_active:
+        raise AuthenticationFailed('User account is disabled', 'disabled')
+    if 'ver' in payload and payload['ver'] != user.token_version:
+        raise AuthenticationFailed('Token has been revoked', 'revoked')
+    return user
+
+async def aget_user_from_payload(payload):
+    """get_user_from_payload() for async views, loading the account with the async ORM"""
+    user_id = payload.get('user_id')
+    if not user_id:
+        raise AuthenticationFailed('User ID not found in token')
+
+    user = await sync_to_async(user_cache.get)(user_id)
+    if user is None:
+        try:
+            user = await User.objects.aget(id=user_id)
+        except User.DoesNotExist:
+            raise AuthenticationFailed('User not found', 'unknown_user')
+        await sync_to_async(user_cache.set)(user, token_exp=payload.get('exp'))
+        await sync_to_async(user_cache.set_token_version)(user.pk, user.token_version)
+
+    if not user.is_active:
+        raise AuthenticationFailed('User account is disabled', 'disabled')
+    if 'ver' in payload and payload['ver'] != user.token_version:
+        raise AuthenticationFailed('Token has been revoked', 'revoked')
+    return user
+
+def get_claims_user(payload):
+    """
+    Build a ClaimsUser for a snapshot token, checking its version against the
+    published token_version. The account is loaded (through the user cache)
+    when the version is unknown or differs, which also rejects revoked tokens.
+    Versions are only published in a shared cache, so without one every
+    snapshot token is checked against the account.
+    """
+    current_version = user_cache.get_token_version(payload['user_id'])
+    if current_version is None or current_version != payload.get('ver'):
+        get_user_from_payload(payload)
+    return ClaimsUser(payload)
+
+def is_snapshot_payload(payload):
+    return all(claim in payload for claim in ('user_id', 'ver', 'is_staff', 'is_active'))
+
+def _lazy_user(payload):
+    """Resolve the user on first access; a deleted or disabled account reads as anonymous"""
+    try:
+        return get_user_from_payload(payload)
+    except AuthenticationFailed:
+        return AnonymousUser()
+
+def auth_failed_response(error):
+    """401 response for a failed authentication, counted by reason"""
+    auth_failures_total.inc(reason=error.reason)
+    return JsonResponse({'error': str(error)}, status=401)
+
+def authenticate_request(request):
+    """
+    Authenticate a request from its bearer token.
+
+    The token is parsed and verified exactly once per request. On success the
+    claims are attached as ``request.jwt_payload`` and ``request.user`` becomes
+    a lazy object, so the account is only queried if the view touches it.
+    Safe-method requests carrying a snapshot token get a ClaimsUser instead,
+    which needs no query at all. Returns ``None`` on success or a 401
+    ``JsonResponse``.
+    """
+    if getattr(request, 'jwt_payload', None) is not None:
+        # Already authenticated earlier in this request (e.g. mixin + decorator)
+        return None
+
+    try:
+        payload = decode_token(get_bearer_token(request))
+    except AuthenticationFailed as e:
+        return auth_failed_response(e)
+
+    if request.method in SAFE_METHODS and is_snapshot_payload(payload):
+        try:
+            request.user = get_claims_user(payload)
+        except AuthenticationFailed as e:
+            return auth_failed_response(e)
+    else:
+        request.user = SimpleLazyObject(lambda: _lazy_user(payload))
+
+    request.jwt_payload = payload
+    return None
+
+async def aauthenticate_request(request):
+    """
+    authenticate_request() for async views.
+
+    The revocation and token version checks, which may reach the cache or the
+    database, run in a worker thread. ``request.user`` is resolved right away
+    with the async ORM instead of lazily, since a lazy object cannot query
+    from the event loop; as with the lazy user, a deleted or disabled account
+    reads as anonymous.
+    """
+    if getattr(request, 'jwt_payload', None) is not None:
+        return None
+
+    try:
+        payload = await sync_to_async(decode_token)(get_bearer_token(request))
+    except AuthenticationFailed as e:
+        return auth_failed_response(e)
+
+    if request.method in SAFE_METHODS and is_snapshot_payload(payload):
+        try:
+            request.user = await sync_to_async(get_claims_user)(payload)
+        except AuthenticationFailed as e:
+            return auth_failed_response(e)
+    else:
+        try:
+            request.user = await aget_user_from_payload(payload)
+        except AuthenticationFailed:
+            request.user = AnonymousUser()
+
+    request.jwt_payload = payload
+    return None
+
+def verify_jwt(request):
+    """Verify JWT token from request"""
+    try:
+        return decode_token(get_bearer_token(request)), None
+    except AuthenticationFailed as e:
+        return None, auth_failed_response(e)
 
 def decode_jwt_token(token):
     """Decode JWT token and return user"""
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        
-        user_id = payload.get('user_id')
-        if user_id:
-            user = User.objects.get(id=user_id)
-            return user
-        else:
-            raise Exception('User ID not found in token')
-            
-    except jwt.ExpiredSignatureError:
-        raise Exception('Token has expired')
-    except jwt.InvalidTokenError as e:
-        raise Exception(f'Invalid token: {str(e)}')
-    except User.DoesNotExist:
-        raise Exception('User not found')
-    except Exception as e:
-        raise Exception(f'Token decoding failed: {str(e)}')
\ No newline at end of file
+        return get_user_from_payload(decode_token(token))
+    except AuthenticationFailed as e:
+        raise Exception(str(e))
@@ -0,0 +1,231 @@
+# utilities/log_handlers.py
+import datetime
+import glob
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import shutil
+import time
+
+from utilities.global_functions import is_pid_alive
+from utilities.json_encoding import dumps
+
+
+def get_handler(name):
+    """Handler configured under name in LOGGING (named handlers are only weakly referenced)"""
+    getter = getattr(logging, 'getHandlerByName', None)  # Python 3.12+
+    handler = getter(name) if getter else logging._handlers.get(name)
+    if handler is None:
+        raise ValueError(f'Log handler {name!r} is not configured (yet)')
+    return handler
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room rather than failing on a full queue when stopping
+        self.queue.put(self._sentinel)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a background thread that writes them to the ``targets``
+    handlers (names of other LOGGING handlers), so the logging thread never
+    waits on file I/O.
+
+    The queue holds at most ``queue_size`` records. When it is full the
+    ``drop`` policy discards the record right away and ``block`` waits up to
+    ``block_timeout`` seconds for room before discarding it; the number of
+    dropped records is logged once the queue has room again.
+
+    Configure it with the ``()`` key rather than ``class``: Python 3.12+
+    dictConfig builds ``class`` QueueHandlers its own way. dictConfig sets
+    up handlers in name order, so the targets' names must sort before this
+    handler's. The listener thread starts on the first record, in the
+    process that logs it.
+    """
+
+    def __init__(self, targets, queue_size=10000, policy='drop', block_timeout=0.05):
+        if policy not in ('drop', 'block'):
+            raise ValueError(f'Unknown queue policy: {policy}')
+        super().__init__(queue.Queue(queue_size))
+        self.targets = [get_handler(name) for name in targets]
+        self.queue_size = queue_size
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.listener = None
+        self._pid = None
+
+    def start(self):
+        if self._pid is not None:
+            # Forked: the parent's listener thread does not exist here
+            self.queue = queue.Queue(self.queue_size)
+        self.listener = _QueueListener(self.queue, *self.targets, respect_handler_level=True)
+        self.listener.start()
+        self._pid = os.getpid()
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self.start()
+        super().emit(record)
+
+    def prepare(self, record):
+        # Records only go to threads of this process, so unlike the base class
+        # this neither copies the record nor formats it (the targets do): the
+        # message is merged with its args now, while they have their current values
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            if self.policy == 'block':
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped:
+            notice = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                '%d log records dropped, queue full', (self.dropped,), None
+            )
+            try:
+                self.queue.put_nowait(notice)
+                self.dropped = 0
+            except queue.Full:
+                pass
+
+    def close(self):
+        # Writes out what is still queued
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+        super().close()
+
+
+class RotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    File handler rotating on size and time, with gzip compressed backups.
+
+    The file rolls over when a record would take it past ``max_bytes`` or
+    every ``interval`` seconds (aligned to the epoch, so 86400 rolls over at
+    midnight UTC; 0 disables either). ``backup_count`` backups are kept as
+    ``<filename>.1.gz`` (newest) to ``<filename>.<backup_count>.gz``.
+
+    Rotation renames the file, which is only safe with a single writer. With
+    ``per_process`` each process writes (and rotates) its own file, the pid
+    inserted before the extension (``debug.log`` becomes ``debug.<pid>.log``),
+    chosen when the process first writes so forked workers get theirs. As
+    pids change with every restart, the files (and backups) of exited
+    processes are then pruned down to the ``backup_count`` most recent.
+    """
+
+    def __init__(self, filename, max_bytes=0, interval=0, backup_count=5, compress=True, per_process=False,
+                 encoding='utf-8', delay=True):
+        if per_process:
+            delay = True
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=delay)
+        self.base_path = self.baseFilename
+        self.per_process = per_process
+        self._pid = None
+        self.interval = interval
+        self.rollover_at = self.compute_rollover(time.time()) if interval else None
+        if compress:
+            self.namer = self.gzip_namer
+            self.rotator = self.gzip_rotator
+
+    def emit(self, record):
+        if self.per_process and self._pid != os.getpid():
+            self.use_process_file()
+        super().emit(record)
+
+    def use_process_file(self):
+        if self.stream is not None:
+            # Opened by the parent before forking: its file is not ours to write or rotate
+            self.stream.close()
+            self.stream = None
+        self._pid = os.getpid()
+        root, ext = os.path.splitext(self.base_path)
+        self.baseFilename = f'{root}.{self._pid}{ext}'
+        self.prune_exited_files()
+
+    def prune_exited_files(self):
+        """Delete files of exited processes but the backup_count most recently written"""
+        root, ext = os.path.splitext(self.base_path)
+        pattern = re.compile(rf'{re.escape(root)}\.(\d+){re.escape(ext)}(?:\.\d+)?(?:\.gz)?')
+        exited = []
+        for path in glob.glob(f'{glob.escape(root)}.*'):
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            pid = int(match[1])
+            if pid == self._pid or is_pid_alive(pid):
+                continue
+            try:
+                exited.append((os.path.getmtime(path), path))
+            except OSError:
+                pass  # pruned by another process meanwhile
+        exited.sort(reverse=True)
+        for _, path in exited[self.backupCount:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def compute_rollover(self, now):
+        return (int(now) // self.interval + 1) * self.interval
+
+    def shouldRollover(self, record):
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            if os.path.isfile(self.baseFilename) and os.path.getsize(self.baseFilename):
+                return True
+            self.rollover_at = self.compute_rollover(time.time())
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        if self.interval:
+            self.rollover_at = self.compute_rollover(time.time())
+
+    @staticmethod
+    def gzip_namer(name):
+        return f'{name}.gz'
+
+    @staticmethod
+    def gzip_rotator(source, dest):
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per record: time (UTC), level, logger and message, then
+    the fields passed in ``extra`` (method, path, status... for request logs).
+    """
+    # Attributes of every LogRecord, anything else came from ``extra``
+    reserved = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+    def format(self, record):
+        data = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in self.reserved:
+                data[key] = value
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        try:
+            return dumps(data).decode()
+        except TypeError:
+            # extra objects the encoder does not know (django.request passes the request)
+            return dumps({key: value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+                          for key, value in data.items()}).decode()
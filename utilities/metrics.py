@@ -0,0 +1,311 @@
+# utilities/metrics.py
+import bisect
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+from utilities.global_functions import is_pid_alive
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    """Base class for labelled in-process metrics"""
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        try:
+            if len(labels) == len(self.labelnames):
+                return tuple([str(labels[name]) for name in self.labelnames])
+        except KeyError:
+            pass
+        raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def collect(self):
+        """The metric and its samples as JSON-compatible data, see render_text()"""
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'documentation': self.documentation,
+            'labelnames': list(self.labelnames),
+            'samples': [[list(key), value] for key, value in self.snapshot().items()],
+        }
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Value going up and down, such as requests in flight"""
+    kind = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last slot is +Inf), sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            # First bucket whose bound is >= value, len(buckets) for +Inf
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+
+    def collect(self):
+        data = super().collect()
+        data['buckets'] = list(self.buckets)
+        return data
+
+
+class MetricsRegistry:
+    """Process-wide collection of named metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _register(self, metric_class, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f'Metric {name} is already registered as a {metric.kind}')
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def metrics(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+    def collect(self):
+        return [metric.collect() for metric in self.metrics()]
+
+
+registry = MetricsRegistry()
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + '}'
+
+
+def render_text(collected):
+    """Prometheus text exposition format (0.0.4) of collect() data"""
+    lines = []
+    for metric in sorted(collected, key=lambda metric: metric['name']):
+        name, labelnames = metric['name'], metric['labelnames']
+        lines.append(f"# HELP {name} {_escape(metric['documentation'])}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        for key, value in sorted(metric['samples']):
+            if metric['kind'] != 'histogram':
+                lines.append(f'{name}{_format_labels(labelnames, key)} {_format_value(value)}')
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip([*metric['buckets'], float('inf')], counts):
+                cumulative += count
+                labels = _format_labels(labelnames, key, [('le', _format_value(bound))])
+                lines.append(f'{name}_bucket{labels} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labelnames, key)} {_format_value(total)}')
+            lines.append(f'{name}_count{_format_labels(labelnames, key)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+def merge(collections):
+    """
+    Combine collect() data of several processes, given as (collected,
+    process is alive) pairs: counters and histograms are summed over every
+    process, gauges over live ones only.
+    """
+    merged = {}
+    for collected, alive in collections:
+        for metric in collected:
+            if metric['kind'] == 'gauge' and not alive:
+                continue
+            target = merged.setdefault(metric['name'], {**metric, 'samples': {}})
+            for key, value in metric['samples']:
+                key = tuple(key)
+                current = target['samples'].get(key)
+                if current is None:
+                    target['samples'][key] = value
+                elif metric['kind'] == 'histogram':
+                    target['samples'][key] = [[a + b for a, b in zip(current[0], value[0])], current[1] + value[1]]
+                else:
+                    target['samples'][key] = current + value
+    return [
+        {**metric, 'samples': [[list(key), value] for key, value in metric['samples'].items()]}
+        for metric in merged.values()
+    ]
+
+
+class MultiprocessDirectory:
+    """
+    Shares metrics between the worker processes of a server (gunicorn
+    workers each have their own registry) through a directory.
+
+    Every process writes its registry to ``<pid>-<random>.json`` every
+    ``interval`` seconds from a background thread, and the one serving
+    ``/metrics`` merges all the files. Files of exited workers are kept, so
+    counters do not go back when a worker is replaced; their gauges are left
+    out. The random part keeps a new worker that reuses a dead one's pid from
+    overwriting its file; the new worker renames such files ``exited-...``
+    instead, as their pid is no longer theirs. Empty the directory when the
+    server starts.
+    """
+
+    def __init__(self, path, interval=1.0, registry=registry):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._pid = None
+        self._file_pid = None
+        self._file_path = None
+        os.makedirs(path, exist_ok=True)
+
+    def write(self):
+        """Write this process' metrics, replacing its file atomically"""
+        fd, temp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump({'pid': os.getpid(), 'metrics': self.registry.collect()}, file)
+        os.replace(temp_path, self.get_file_path())
+
+    def get_file_path(self):
+        """This process' file, named on its first write"""
+        with self._lock:
+            pid = os.getpid()
+            if self._file_pid != pid:
+                for file_path in glob.glob(os.path.join(self.path, f'{pid}-*.json')):
+                    try:
+                        os.replace(file_path, os.path.join(self.path, f'exited-{os.path.basename(file_path)}'))
+                    except OSError:
+                        pass  # renamed by another thread meanwhile
+                self._file_pid = pid
+                self._file_path = os.path.join(self.path, f'{pid}-{uuid.uuid4().hex[:12]}.json')
+            return self._file_path
+
+    def read(self):
+        """Metrics of every process that wrote some, merged"""
+        collections = []
+        for file_path in glob.glob(os.path.join(self.path, '*.json')):
+            try:
+                with open(file_path) as file:
+                    data = json.load(file)
+            except (OSError, ValueError):
+                continue  # removed or being replaced meanwhile
+            pid = data['pid']
+            if os.path.basename(file_path).startswith('exited-'):
+                alive = False
+            else:
+                alive = pid == os.getpid() or is_pid_alive(pid)
+            collections.append((data['metrics'], alive))
+        return merge(collections)
+
+    def ensure_writing(self):
+        """Start the writer thread unless it already runs in this process (forks do not inherit it)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                threading.Thread(target=self._write_periodically, name='metrics-writer', daemon=True).start()
+
+    def _write_periodically(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.write()
+            except OSError:
+                pass  # next interval
+
+
+_multiprocess_directory = None
+
+
+def get_multiprocess_directory():
+    """MultiprocessDirectory of settings.METRICS_MULTIPROC_DIR, None when unset (single process)"""
+    global _multiprocess_directory
+    if _multiprocess_directory is None and settings.METRICS_MULTIPROC_DIR:
+        _multiprocess_directory = MultiprocessDirectory(
+            settings.METRICS_MULTIPROC_DIR, settings.METRICS_WRITE_INTERVAL
+        )
+    return _multiprocess_directory
+
+
+def export():
+    """Prometheus text of this process' metrics, or of every process' with METRICS_MULTIPROC_DIR"""
+    directory = get_multiprocess_directory()
+    if directory is None:
+        return render_text(registry.collect())
+    directory.write()
+    return render_text(directory.read())
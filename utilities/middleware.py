@@ -1,35 +1,244 @@
-import time
 import logging
-from django.utils.deprecation import MiddlewareMixin
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject, empty
+
+from utilities import instrumentation
+from utilities.metrics import get_multiprocess_directory, registry
 
 logger = logging.getLogger(__name__)
 
-class RequestLoggingMiddleware(MiddlewareMixin):
-    """Custom middleware to log request details"""
-    
-    def process_request(self, request):
-        """Start timer for request"""
-        request._start_time = time.time()
-    
-    def process_response(self, request, response):
-        """Log request details"""
-        if hasattr(request, '_start_time'):
-            duration = (time.time() - request._start_time) * 1000  # Convert to milliseconds
-            logger.info(
-                f"{request.method} {request.get_full_path()} - {response.status_code} - {duration:.2f}ms"
-            )
-            print(f"{request.method} {request.get_full_path()} - {response.status_code} - {duration:.2f}ms")
-        
-        return response
-    
-class CSRFExemptAPIMiddleware:
+DB_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+DB_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Anything else is counted as "other", so made-up methods cannot add label values
+HTTP_METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+requests_total = registry.counter(
+    'http_requests_total', 'HTTP requests by URL name, method and status', labelnames=('url_name', 'method', 'status')
+)
+request_duration_seconds = registry.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by URL name', labelnames=('url_name', 'method')
+)
+requests_in_flight = registry.gauge(
+    'http_requests_in_flight', 'HTTP requests being handled'
+)
+request_db_queries = registry.histogram(
+    'http_request_db_queries', 'Database queries per request by URL name', labelnames=('url_name',),
+    buckets=DB_QUERY_BUCKETS,
+)
+request_db_seconds = registry.histogram(
+    'http_request_db_seconds', 'Database time per request by URL name', labelnames=('url_name',),
+    buckets=DB_TIME_BUCKETS,
+)
+
+
+class AsyncCapableMiddleware:
+    """
+    Base for middleware running natively in both sync and async chains, so
+    Django never adapts the chain around it (a thread hop per request).
+    Subclasses implement ``handle(request)`` and, when it needs to await
+    the response, ``ahandle(request)``.
+    """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        # Skip CSRF for API endpoints
+        if self.async_mode:
+            return self.ahandle(request)
+        return self.handle(request)
+
+    def handle(self, request):
+        return self.get_response(request)
+
+    async def ahandle(self, request):
+        return await self.get_response(request)
+
+
+class RequestLoggingMiddleware(AsyncCapableMiddleware):
+    """
+    Logs method, path, status and duration of requests, with the user id,
+    the number of database queries, their total time and the slowest ones
+    as extra record fields (see the JSON records of REQUEST_LOG_FILE).
+    Streaming responses are logged once their content has been sent. With
+    SERVER_TIMING the database and total times so far are also sent in a
+    ``Server-Timing`` header.
+
+    REQUEST_LOG_LEVEL sets the level of the log lines ("OFF" disables them)
+    and REQUEST_LOG_SAMPLE_RATE the share of requests logged. Server errors
+    and requests slower than REQUEST_LOG_SLOW_MS are logged at WARNING
+    whatever the sample. Nothing is formatted for requests that are not logged.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        level = settings.REQUEST_LOG_LEVEL.upper()
+        self.level = None if level == 'OFF' else logging.getLevelName(level)
+        if self.level is not None and not isinstance(self.level, int):
+            raise ValueError(f'Unknown REQUEST_LOG_LEVEL: {settings.REQUEST_LOG_LEVEL}')
+        self.sample_rate = settings.REQUEST_LOG_SAMPLE_RATE
+        self.slow_ns = settings.REQUEST_LOG_SLOW_MS * 1_000_000
+        self.server_timing = settings.SERVER_TIMING
+
+    def handle(self, request):
+        stats, token = instrumentation.start_request()
+        started = time.perf_counter_ns()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.end_request(token)
+        return self.finish(request, response, started, stats)
+
+    async def ahandle(self, request):
+        stats, token = instrumentation.start_request()
+        started = time.perf_counter_ns()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.end_request(token)
+        return self.finish(request, response, started, stats)
+
+    def finish(self, request, response, started, stats):
+        if self.server_timing:
+            # Sent with the headers: streamed bodies are not in it
+            self.add_server_timing(response, time.perf_counter_ns() - started, stats)
+        instrumentation.on_response_complete(
+            response, stats,
+            lambda: self.log_request(request, response, time.perf_counter_ns() - started, stats),
+        )
+        return response
+
+    def get_level(self, response, duration_ns):
+        """Level to log the request at, None to skip it"""
+        if response.status_code >= 500 or (self.slow_ns and duration_ns >= self.slow_ns):
+            return logging.WARNING
+        if self.level is None or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return None
+        return self.level
+
+    @staticmethod
+    def add_server_timing(response, duration_ns, stats):
+        timing = (
+            f'db;dur={stats.db_time_ns / 1e6:.2f};desc="{stats.query_count} queries", '
+            f'app;dur={duration_ns / 1e6:.2f}'
+        )
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+
+    @staticmethod
+    def get_user_id(request):
+        """Id of the authenticated user, without loading one that was not loaded yet"""
+        payload = getattr(request, 'jwt_payload', None)
+        if payload:
+            return payload.get('user_id')
+        user = getattr(request, 'user', None)
+        if user is None or (isinstance(user, SimpleLazyObject) and user._wrapped is empty):
+            return None
+        return user.pk if user.is_authenticated else None
+
+    def log_request(self, request, response, duration_ns, stats):
+        level = self.get_level(response, duration_ns)
+        if level is None or not logger.isEnabledFor(level):
+            return
+        path = request.get_full_path()
+        duration_ms = duration_ns / 1e6
+        logger.log(
+            level, '%s %s - %s - %.2fms',
+            request.method, path, response.status_code, duration_ms,
+            extra={
+                'method': request.method,
+                'path': path,
+                'status': response.status_code,
+                'duration_ms': round(duration_ms, 3),
+                'user_id': self.get_user_id(request),
+                'query_count': stats.query_count,
+                'db_time_ms': round(stats.db_time_ns / 1e6, 3),
+                'slowest_queries': stats.get_slowest(),
+            },
+        )
+
+
+class CSRFExemptAPIMiddleware(AsyncCapableMiddleware):
+    """Skip CSRF checks for API endpoints, which authenticate with JWTs rather than cookies"""
+
+    def handle(self, request):
         if request.path.startswith("/api/"):
             request._dont_enforce_csrf_checks = True
+        return self.get_response(request)
 
-        response = self.get_response(request)
+    async def ahandle(self, request):
+        if request.path.startswith("/api/"):
+            request._dont_enforce_csrf_checks = True
+        return await self.get_response(request)
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Records request metrics: latency and count by URL name (``post-list``,
+    ``login``...), method and status, requests in flight and the database
+    queries and time of each request. First in MIDDLEWARE, so the latency
+    covers the whole chain; streaming responses are observed (and stay in
+    flight) until their content has been sent. With METRICS_MULTIPROC_DIR
+    it keeps this process' metrics file up to date, see utilities.metrics.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.multiprocess_directory = get_multiprocess_directory()
+
+    def handle(self, request):
+        if self.multiprocess_directory is not None:
+            self.multiprocess_directory.ensure_writing()
+        stats, token = instrumentation.start_request()
+        requests_in_flight.inc()
+        started = time.perf_counter_ns()
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            requests_in_flight.dec()
+            raise
+        finally:
+            instrumentation.end_request(token)
+        return self.finish(request, response, started, stats)
+
+    async def ahandle(self, request):
+        if self.multiprocess_directory is not None:
+            self.multiprocess_directory.ensure_writing()
+        stats, token = instrumentation.start_request()
+        requests_in_flight.inc()
+        started = time.perf_counter_ns()
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            requests_in_flight.dec()
+            raise
+        finally:
+            instrumentation.end_request(token)
+        return self.finish(request, response, started, stats)
+
+    def finish(self, request, response, started, stats):
+        def complete():
+            requests_in_flight.dec()
+            self.observe(request, response, time.perf_counter_ns() - started, stats)
+
+        instrumentation.on_response_complete(response, stats, complete)
         return response
+
+    @staticmethod
+    def observe(request, response, duration_ns, stats):
+        match = request.resolver_match
+        url_name = match.view_name if match is not None and match.view_name else 'unmatched'
+        method = request.method if request.method in HTTP_METHODS else 'other'
+        requests_total.inc(url_name=url_name, method=method, status=response.status_code)
+        request_duration_seconds.observe(duration_ns / 1e9, url_name=url_name, method=method)
+        request_db_queries.observe(stats.query_count, url_name=url_name)
+        request_db_seconds.observe(stats.db_time_ns / 1e9, url_name=url_name)
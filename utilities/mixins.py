@@ -1,10 +1,31 @@
 import json
-from django.http import JsonResponse
+import base64
+import binascii
+import hashlib
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date, quote_etag
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.core.paginator import Paginator
 from django.db.models import Q
 
+from utilities import json_encoding
+from utilities.counting import CountingPaginator, QueryCounter
+from utilities.response_cache import response_cache
+from utilities.search import resolve_search_fields
+
+
+class PaginationError(ValueError):
+    """Raised when pagination parameters (page, page_size, cursor) are invalid"""
+
+
+class FieldsError(ValueError):
+    """Raised when sparse fieldset parameters (fields, excerpt_length) are invalid"""
+
 
 class JSONResponseMixin:
     """Mixin to handle JSON responses"""
@@ -29,20 +50,36 @@ class JSONResponseMixin:
         if errors:
             response_data['errors'] = errors
             
-        return JsonResponse(response_data, status=status, safe=False)
+        return HttpResponse(
+            json_encoding.dumps(response_data), status=status, content_type='application/json'
+        )
     
-    def serialize_object(self, obj):
-        """Basic serialization for model objects"""
+    def streaming_json_response(self, data, status=200):
+        """
+        Stream a JSON response. Iterator values of data (e.g. rows from a
+        queryset iterator) are written as arrays one item at a time, see
+        utilities.json_encoding.iterdumps. Async iterators make it an async
+        stream (aiterdumps), for async views under ASGI. Errors raised while
+        streaming can no longer change the status code.
+        """
+        if any(isinstance(value, AsyncIterator) for value in data.values()):
+            content = json_encoding.aiterdumps(data)
+        else:
+            content = json_encoding.iterdumps(data)
+        return StreamingHttpResponse(content, status=status, content_type='application/json')
+
+    def serialize_object(self, obj, fields=None):
+        """Basic serialization for model objects, limited to ``fields`` if given"""
         if hasattr(obj, 'to_dict'):
-            return obj.to_dict()
+            return obj.to_dict() if fields is None else obj.to_dict(fields=fields)
         
         # Default serialization for Post model
         data = {
             'id': obj.id,
             'title': obj.title,
             'content': obj.content,
-            'created_at': obj.created_at.isoformat(),
-            'updated_at': obj.updated_at.isoformat(),
+            'created_at': obj.created_at,
+            'updated_at': obj.updated_at,
         }
         
         if hasattr(obj, 'author'):
@@ -51,6 +88,8 @@ class JSONResponseMixin:
                 'username': obj.author.username,
                
             }
+        if fields is not None:
+            data = {name: value for name, value in data.items() if name in fields}
         return data
     
     def get_json_data(self, request):
@@ -60,47 +99,471 @@ class JSONResponseMixin:
         except json.JSONDecodeError:
             return None
         
+class ConditionalResponseMixin:
+    """
+    Mixin for HTTP validators (ETag / Last-Modified) and 304 responses.
+
+    Views compute the validators from cheap columns, call ``not_modified()``
+    before serializing anything and ``set_validators()`` on the full response.
+    """
+    # Request headers that change the response body, e.g. Authorization for
+    # views that show drafts to their owner
+    vary_headers = ()
+    # Keys of dict extras left out of list ETags: how the total was counted
+    # changes between requests without the page changing
+    list_etag_ignore = ('count_strategy',)
+
+    def get_etag(self, obj_id, updated_at):
+        """Strong ETag of one row version"""
+        return quote_etag(f'{obj_id}-{int(updated_at.timestamp() * 1_000_000)}')
+
+    def get_list_etag(self, rows, *extra):
+        """Weak ETag over the (id, updated_at) of a page of rows plus extra state"""
+        digest = hashlib.sha1()
+        for row in rows:
+            if isinstance(row, dict):
+                obj_id, updated_at = row['id'], row['updated_at']
+            else:
+                obj_id, updated_at = row.id, row.updated_at
+            digest.update(f'{obj_id}:{updated_at.isoformat()};'.encode())
+        for value in extra:
+            if isinstance(value, dict):
+                value = {key: item for key, item in value.items() if key not in self.list_etag_ignore}
+            digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+        return f'W/"{digest.hexdigest()}"'
+
+    def not_modified(self, request, etag=None, last_modified=None):
+        """Return a 304 response if the client's copy is current, else None"""
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is not None:
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    def set_validators(self, response, etag=None, last_modified=None):
+        if etag:
+            response.headers['ETag'] = etag
+        if last_modified:
+            response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+        if self.vary_headers:
+            patch_vary_headers(response, self.vary_headers)
+        return response
+
+
+class ResponseCacheMixin(ConditionalResponseMixin):
+    """
+    Serve GET responses from the shared response cache (utilities.response_cache).
+
+    ``get_cached_response()`` returns a hit or registers the request as the
+    one rebuilding the entry; the rebuilt response must then go through
+    ``cache_response()``, which stores it (only ``200`` responses not marked
+    ``Cache-Control: private``) and releases the rebuild lock either way.
+    Hits still honour If-None-Match / If-Modified-Since; responses are marked
+    ``X-Cache: HIT`` or ``MISS``.
+    """
+    cache_namespace = None
+    cache_ticket = None
+
+    def get_cached_response(self, request, key):
+        """Return the cached response for key, or None if the caller has to build it"""
+        if key is None:
+            return None
+        entry, self.cache_ticket = response_cache.get(self.cache_namespace, key)
+        if entry is None:
+            return None
+
+        last_modified = None
+        if entry['last_modified']:
+            last_modified = datetime.fromtimestamp(parse_http_date(entry['last_modified']), tz=timezone.utc)
+        response = self.not_modified(request, etag=entry['etag'], last_modified=last_modified)
+        if response is None:
+            response = HttpResponse(entry['content'], content_type='application/json')
+            self.set_validators(response, entry['etag'], last_modified)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def cache_response(self, request, response):
+        """Store the response built after a miss and release the rebuild lock"""
+        ticket, self.cache_ticket = self.cache_ticket, None
+        if ticket is None:
+            return response
+        if (
+            response.status_code != 200
+            or response.streaming
+            or 'private' in response.get('Cache-Control', '')
+        ):
+            response_cache.release(ticket)
+            return response
+
+        response_cache.set(ticket, {
+            'content': response.content,
+            'etag': response.get('ETag'),
+            'last_modified': response.get('Last-Modified'),
+        })
+        response['X-Cache'] = 'MISS'
+        return response
+
+    # Cache backends are synchronous (and a lookup may wait for another
+    # request's rebuild), async views run them in a worker thread
+
+    async def aget_cached_response(self, request, key):
+        return await sync_to_async(self.get_cached_response)(request, key)
+
+    async def acache_response(self, request, response):
+        return await sync_to_async(self.cache_response)(request, response)
+
+
+class SparseFieldsMixin:
+    """
+    Mixin serializing list rows with a ValuesSerializer (utilities.serializers)
+    and sparse fieldsets: ``?fields=id,title,excerpt``.
+
+    Querysets become ``.values()`` querysets of the columns behind the
+    requested fields, so columns nobody asked for (e.g. ``content``) are never
+    read and rows are never instantiated as models. Fields computed in the
+    database come from ``get_field_annotations()``.
+    """
+    serializer_class = None
+    # Loaded whatever was requested: ETags and cursors are computed from them
+    always_loaded_fields = ('id', 'created_at', 'updated_at')
+
+    def get_fields(self, request):
+        """Return the requested field names, or None for the serializer's defaults"""
+        value = request.GET.get('fields', '')
+        if not value.strip():
+            return None
+        fields = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in fields if name not in self.serializer_class.fields]
+        if unknown:
+            raise FieldsError(f'Unknown fields: {", ".join(unknown)}')
+        return fields
+
+    def get_serializer(self, request):
+        """Serializer for the fields requested by ?fields="""
+        return self.serializer_class(self.get_fields(request))
+
+    def get_field_annotations(self, request, fields):
+        """Return {name: expression} for requested fields computed in the database"""
+        return {}
+
+    def get_key_columns(self, queryset, ordering=None):
+        """Columns pagination and validators read: always_loaded_fields plus the ordering column"""
+        columns = [*self.always_loaded_fields]
+        if ordering:
+            # The ordering column is read back for cursors (not "relevance")
+            field = ordering.lstrip('-')
+            if any(f.name == field for f in queryset.model._meta.concrete_fields):
+                columns.append(field)
+        return columns
+
+    def apply_fields(self, queryset, request, serializer, ordering=None):
+        """Turn queryset into values() rows of the serializer's columns"""
+        annotations = self.get_field_annotations(request, serializer.field_names)
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return serializer.values(queryset.select_related(None), extra=self.get_key_columns(queryset, ordering))
+
+    def get_page_keys(self, queryset, ordering=None):
+        """
+        values() rows of the key columns only, for a queryset before apply_fields().
+
+        Streamed pages are paginated (and their ETag computed) on these
+        light rows first; iter_page_rows() then reads the full rows.
+        """
+        return queryset.values(*self.get_key_columns(queryset, ordering))
+
+    def get_page_rows(self, queryset, keys, ordering=None):
+        """The full rows of a page of keys, in page order"""
+        queryset = queryset.filter(pk__in=[key['id'] for key in keys])
+        if ordering != 'relevance':
+            # Pages are ordered on (field, id), see PaginationMixin
+            ordering = ordering or self.default_ordering
+            queryset = queryset.order_by(ordering, '-id' if ordering.startswith('-') else 'id')
+        return queryset
+
+    def iter_page_rows(self, queryset, keys, ordering=None):
+        """
+        Iterate get_page_rows() from a server-side cursor reading
+        settings.LIST_STREAMING_CHUNK_SIZE rows at a time.
+        """
+        return self.get_page_rows(queryset, keys, ordering).iterator(
+            chunk_size=settings.LIST_STREAMING_CHUNK_SIZE
+        )
+
+    def aiter_page_rows(self, queryset, keys, ordering=None):
+        """iter_page_rows() as an async iterator"""
+        return self.get_page_rows(queryset, keys, ordering).aiterator(
+            chunk_size=settings.LIST_STREAMING_CHUNK_SIZE
+        )
+
+
 class PaginationMixin:
-    """Mixin to handle pagination"""
+    """Mixin to handle pagination
+
+    Two modes are supported:
+
+    * offset (default) - ``?page=<n>`` backed by Django's ``Paginator``.
+    * cursor (opt-in)  - ``?cursor=`` (empty for the first page) or
+      ``?pagination=cursor``. Pages are fetched with a keyset seek on
+      ``(<ordering field>, id)`` so the cost of a page does not grow with
+      its depth. ``total``/``pages`` are only computed when the client
+      passes ``include_total=true``.
+
+    Totals go through a QueryCounter (see utilities.counting); the strategy
+    that produced the number is reported as ``count_strategy``.
+    """
     page_size = 10
     max_page_size = 100
-    
-    def paginate_queryset(self, queryset, request):
+    # None falls back to settings.PAGINATION_COUNT_STRATEGY
+    count_strategy = None
+    default_ordering = '-created_at'
+    # Orderings that can be paginated with a cursor. Each one seeks on
+    # (field, id) so that rows sharing the same field value stay stable.
+    cursor_orderings = ['created_at', '-created_at', 'title', '-title', 'updated_at', '-updated_at']
+
+    def get_page_size(self, request):
+        """Return the requested page size bounded by max_page_size"""
+        try:
+            page_size = int(request.GET.get('page_size', self.page_size))
+        except ValueError:
+            raise PaginationError('page_size must be an integer')
+        if page_size < 1:
+            raise PaginationError('page_size must be a positive integer')
+        return min(page_size, self.max_page_size)
+
+    def use_streaming(self, request):
+        """Stream pages of at least settings.LIST_STREAMING_MIN_PAGE_SIZE rows (0 disables)"""
+        threshold = getattr(settings, 'LIST_STREAMING_MIN_PAGE_SIZE', 0)
+        if not threshold:
+            return False
+        try:
+            return self.get_page_size(request) >= threshold
+        except PaginationError:
+            return False
+
+    def get_counter(self):
+        """Return the QueryCounter used for totals"""
+        return QueryCounter(strategy=self.count_strategy)
+
+    def use_cursor_pagination(self, request):
+        """Cursor mode is opt-in so existing clients keep page numbers"""
+        return 'cursor' in request.GET or request.GET.get('pagination') == 'cursor'
+
+    def paginate_queryset(self, queryset, request, ordering=None):
         """Paginate queryset"""
-        page_size = min(
-            int(request.GET.get('page_size', self.page_size)),
-            self.max_page_size
-        )
-        page_number = int(request.GET.get('page', 1))
+        if self.use_cursor_pagination(request):
+            return self.cursor_paginate_queryset(queryset, request, ordering)
+
+        page_size = self.get_page_size(request)
+        page_number = request.GET.get('page', 1)
         
-        paginator = Paginator(queryset, page_size)
+        paginator = CountingPaginator(queryset, page_size, counter=self.get_counter())
         page_obj = paginator.get_page(page_number)
         
+        return self.get_page_data(paginator, page_obj, list(page_obj))
+
+    async def apaginate_queryset(self, queryset, request, ordering=None):
+        """paginate_queryset() for async views, reading the count and the page with the async ORM"""
+        if self.use_cursor_pagination(request):
+            return await self.acursor_paginate_queryset(queryset, request, ordering)
+
+        page_size = self.get_page_size(request)
+        counter = self.get_counter()
+        paginator = CountingPaginator(
+            queryset, page_size, counter=counter, count=await counter.acount(queryset)
+        )
+        page_obj = paginator.get_page(request.GET.get('page', 1))
+
+        # object_list is still the unevaluated slice of the queryset
+        return self.get_page_data(paginator, page_obj, [row async for row in page_obj.object_list])
+
+    def get_page_data(self, paginator, page_obj, rows):
+        """Result of offset pagination: the rows and the pagination block"""
         return {
-            'data': list(page_obj),
+            'data': rows,
             'pagination': {
                 'page': page_obj.number,
                 'pages': paginator.num_pages,
-                'per_page': page_size,
+                'per_page': paginator.per_page,
                 'total': paginator.count,
                 'has_next': page_obj.has_next(),
                 'has_previous': page_obj.has_previous(),
+                'count_strategy': paginator.count_strategy,
             }
         }
 
+    def cursor_paginate_queryset(self, queryset, request, ordering=None):
+        """Paginate queryset with an opaque (value, id) keyset cursor"""
+        page = self.prepare_cursor_page(queryset, request, ordering)
+        # Fetch one extra row to learn whether another page exists
+        rows = list(page['queryset'][:page['page_size'] + 1])
+        total = self.get_counter().count(queryset) if page['include_total'] else None
+        return self.get_cursor_page_data(page, rows, total)
+
+    async def acursor_paginate_queryset(self, queryset, request, ordering=None):
+        """cursor_paginate_queryset() for async views"""
+        page = self.prepare_cursor_page(queryset, request, ordering)
+        rows = [row async for row in page['queryset'][:page['page_size'] + 1]]
+        total = await self.get_counter().acount(queryset) if page['include_total'] else None
+        return self.get_cursor_page_data(page, rows, total)
+
+    def prepare_cursor_page(self, queryset, request, ordering=None):
+        """Validate the cursor parameters and build the seek queryset of the page"""
+        ordering = ordering or self.default_ordering
+        if ordering not in self.cursor_orderings:
+            raise PaginationError(f'Cursor pagination is not supported for ordering "{ordering}"')
+
+        page_size = self.get_page_size(request)
+        field = ordering.lstrip('-')
+        descending = ordering.startswith('-')
+
+        cursor = self.decode_cursor(request.GET.get('cursor', ''), ordering)
+        backwards = bool(cursor) and cursor['direction'] == 'previous'
+
+        # Walking backwards means seeking the opposite way and flipping the
+        # rows afterwards, so the same index serves both directions.
+        seek_descending = descending != backwards
+        seek_prefix = '-' if seek_descending else ''
+        page_queryset = queryset.order_by(f'{seek_prefix}{field}', f'{seek_prefix}id')
+
+        if cursor:
+            page_queryset = page_queryset.filter(
+                self.get_seek_filter(field, cursor['value'], cursor['id'], seek_descending)
+            )
+
+        return {
+            'queryset': page_queryset,
+            'ordering': ordering,
+            'field': field,
+            'page_size': page_size,
+            'cursor': cursor,
+            'backwards': backwards,
+            'include_total': request.GET.get('include_total', '').lower() in ('1', 'true', 'yes'),
+        }
+
+    def get_cursor_page_data(self, page, rows, total=None):
+        """
+        Result of cursor pagination from the (page_size + 1) rows read and,
+        with include_total, the (count, strategy) of the whole queryset
+        """
+        page_size, field, ordering = page['page_size'], page['field'], page['ordering']
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if page['backwards']:
+            rows.reverse()
+
+        if page['backwards']:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(page['cursor'])
+
+        pagination = {
+            'per_page': page_size,
+            'has_next': has_next,
+            'has_previous': has_previous,
+            'next_cursor': (
+                self.encode_cursor(rows[-1], field, ordering, 'next')
+                if has_next and rows else None
+            ),
+            'previous_cursor': (
+                self.encode_cursor(rows[0], field, ordering, 'previous')
+                if has_previous and rows else None
+            ),
+        }
+
+        if total is not None:
+            total, strategy = total
+            pagination['total'] = total
+            pagination['pages'] = max(1, -(-total // page_size))
+            pagination['count_strategy'] = strategy
+
+        return {
+            'data': rows,
+            'pagination': pagination,
+        }
+
+    def get_seek_filter(self, field, value, pk, descending):
+        """
+        Build the keyset predicate for (field, id) > / < (value, pk).
+
+        The redundant ``field <= value`` (or ``>=``) bound lets PostgreSQL use
+        the single column index on ``field`` as a range scan.
+        """
+        op = 'lt' if descending else 'gt'
+        bound = 'lte' if descending else 'gte'
+        return Q(**{f'{field}__{bound}': value}) & (
+            Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'id__{op}': pk})
+        )
+
+    def encode_cursor(self, row, field, ordering, direction):
+        """Encode the (value, id) position of a row into an opaque cursor"""
+        value = row[field] if isinstance(row, dict) else getattr(row, field)
+        row_id = row['id'] if isinstance(row, dict) else row.id
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps(
+            {'o': ordering, 'v': value, 'id': row_id, 'd': direction},
+            separators=(',', ':'),
+        )
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor, ordering):
+        """Decode a cursor produced by encode_cursor for the given ordering"""
+        if not cursor:
+            return None
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            value, row_id, direction = payload['v'], int(payload['id']), payload['d']
+            cursor_ordering = payload['o']
+        except (ValueError, TypeError, KeyError, binascii.Error, UnicodeError):
+            raise PaginationError('Invalid cursor')
+
+        if cursor_ordering != ordering:
+            raise PaginationError('Cursor does not match the requested ordering')
+        if direction not in ('next', 'previous'):
+            raise PaginationError('Invalid cursor')
+
+        if ordering.lstrip('-') in ('created_at', 'updated_at'):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise PaginationError('Invalid cursor')
+
+        return {'value': value, 'id': row_id, 'direction': direction}
+
 
 class SearchMixin:
-    """Mixin to handle search functionality"""
+    """Mixin to handle search functionality
+
+    ``search_fields`` entries select the backend with a prefix:
+    ``'title'`` -> substring (icontains), ``'@title'`` -> PostgreSQL full-text,
+    ``'%title'`` -> substring served by pg_trgm indexes, ``'~title'`` -> trigram
+    substring plus typo-tolerant similarity matching.
+    Searched querysets are annotated with ``search_rank``.
+    """
     search_fields = ['title', 'content']
+    # Word similarity threshold for '~' fields; None uses settings.SEARCH_TRIGRAM_THRESHOLD
+    search_similarity_threshold = None
     
+    def get_search_query(self, request):
+        return request.GET.get('search', '').strip()
+
+    def get_search_backend(self):
+        """Return (backend, fields) for this view's search_fields"""
+        backend, fields = resolve_search_fields(self.search_fields)
+        if self.search_similarity_threshold is not None:
+            backend.threshold = self.search_similarity_threshold
+        return backend, fields
+
     def apply_search(self, queryset, request):
         """Apply search filters to queryset"""
-        search_query = request.GET.get('search', '').strip()
+        search_query = self.get_search_query(request)
         if not search_query:
             return queryset
         
-        q_objects = Q()
-        for field in self.search_fields:
-            q_objects |= Q(**{f'{field}__icontains': search_query})
-        
-        return queryset.filter(q_objects)
+        backend, fields = self.get_search_backend()
+        return backend.search(queryset, fields, search_query)
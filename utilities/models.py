@@ -9,6 +9,11 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound="BaseModel")
 
+VALIDATION_FULL = "full"
+VALIDATION_FIELDS = "fields"
+VALIDATION_NONE = "none"
+VALIDATION_MODES = (VALIDATION_FULL, VALIDATION_FIELDS, VALIDATION_NONE)
+
 
 class BaseModel(models.Model):
     """
@@ -50,6 +55,9 @@ class BaseModel(models.Model):
 
     remarks = models.CharField(max_length=300, blank=True, null=True)
 
+    # One of VALIDATION_MODES; None uses settings.MODEL_VALIDATION_MODE
+    validation_mode = None
+
     class Meta:
         abstract = True
         ordering = ["-created_at"]
@@ -78,26 +86,99 @@ class BaseModel(models.Model):
             logger.error(f"Error retrieving {cls.__name__} by reference_id: {e}")
             return None
 
-    def save(self, *args, **kwargs):
-        """Override save to add validation and optimization."""
-        # Run validation
-        self.full_clean()
-
-        # Optimize update_fields if not provided
-        if "update_fields" not in kwargs and self.pk:
-            # Only update changed fields for existing objects
-            original = self.__class__.objects.filter(pk=self.pk).first()
-            if original:
-                changed_fields = []
-                for field in self._meta.fields:
-                    if getattr(self, field.name) != getattr(original, field.name):
-                        changed_fields.append(field.name)
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # Also called to load deferred fields on first access
+        self._snapshot(fields)
+
+    def _snapshot(self, fields=None):
+        """Remember the current values of loaded fields (all, or just ``fields``)"""
+        loaded = self.__dict__.setdefault("_loaded_values", {})
+        for field in self._meta.concrete_fields:
+            if fields is not None and field.name not in fields and field.attname not in fields:
+                continue
+            value = self.__dict__.get(field.attname, models.DEFERRED)
+            if value is models.DEFERRED or hasattr(value, "resolve_expression"):
+                # Unknown until read back from the database
+                loaded.pop(field.attname, None)
+            else:
+                loaded[field.attname] = value
+
+    def get_dirty_fields(self):
+        """
+        Names of concrete fields changed since the instance was loaded or last saved.
 
-                # Always include updated_at for tracking
-                if "updated_at" not in changed_fields:
-                    changed_fields.append("updated_at")
+        Returns None for instances that were not loaded from the database, whose
+        original values are unknown.
+        """
+        loaded = self.__dict__.get("_loaded_values")
+        if loaded is None:
+            return None
+        dirty = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+            if field.attname not in loaded or self.__dict__[field.attname] != loaded[field.attname]:
+                dirty.append(field.name)
+        return dirty
+
+    def field_has_changed(self, name):
+        """True if the field was loaded from the database and has changed since"""
+        dirty = self.get_dirty_fields()
+        return dirty is not None and name in dirty
+
+    def get_validation_mode(self, validation=None):
+        mode = validation or self.validation_mode or getattr(
+            settings, "MODEL_VALIDATION_MODE", VALIDATION_FIELDS
+        )
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation mode {mode!r}, expected one of {VALIDATION_MODES}")
+        return mode
+
+    def validate(self, validation=None):
+        """
+        Validate according to the validation mode.
 
-                if changed_fields:
-                    kwargs["update_fields"] = changed_fields
+        ``full`` runs full_clean(), including the unique and foreign key checks
+        (one query each). ``fields`` checks field values and clean() without
+        touching the database, leaving uniqueness and foreign keys to the
+        database constraints. ``none`` skips validation for trusted bulk paths.
+        """
+        mode = self.get_validation_mode(validation)
+        if mode == VALIDATION_FULL:
+            self.full_clean()
+        elif mode == VALIDATION_FIELDS:
+            self.full_clean(
+                exclude=[field.name for field in self._meta.concrete_fields if field.is_relation],
+                validate_unique=False,
+                validate_constraints=False,
+            )
+
+    def save(self, *args, validation=None, **kwargs):
+        """
+        Validate, then write only the fields that changed.
+
+        Instances loaded from the database are diffed against their loaded values
+        in memory, so an update is a single UPDATE of the dirty fields (plus
+        ``updated_at``) without re-reading the row.
+        """
+        self.validate(validation)
+
+        if kwargs.get("update_fields") is None and not self._state.adding:
+            dirty_fields = self.get_dirty_fields()
+            if dirty_fields is not None:
+                # Always include updated_at for tracking
+                if "updated_at" not in dirty_fields:
+                    dirty_fields.append("updated_at")
+                kwargs["update_fields"] = dirty_fields
 
         super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        self._snapshot(None if update_fields is None else set(update_fields))
@@ -0,0 +1,94 @@
+# utilities/password_pool.py
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db import close_old_connections
+
+from utilities.metrics import registry
+
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+
+hash_seconds = registry.histogram(
+    'login_password_hash_seconds',
+    'Time spent in authenticate() (password hashing) per login attempt',
+    buckets=HASH_BUCKETS,
+)
+queue_wait_seconds = registry.histogram(
+    'login_queue_wait_seconds',
+    'Time a login attempt waited for a password worker',
+)
+rejected_total = registry.counter(
+    'login_rejected_total',
+    'Login attempts rejected before hashing',
+    labelnames=('reason',),
+)
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the password pool cannot take another attempt"""
+
+
+class PasswordVerifier:
+    """
+    Runs ``authenticate()`` on a bounded thread pool.
+
+    At most ``workers`` hashes run at once and at most ``queue_size`` more wait;
+    anything beyond that is refused immediately, so a burst of logins cannot
+    tie up every request worker in password hashing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+
+    def _ensure_pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    workers = getattr(settings, 'LOGIN_PASSWORD_WORKERS', 4)
+                    queue_size = getattr(settings, 'LOGIN_PASSWORD_QUEUE_SIZE', 16)
+                    self._slots = threading.BoundedSemaphore(workers + queue_size)
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=workers, thread_name_prefix='password-verify'
+                    )
+
+    def authenticate(self, **credentials):
+        """Authenticate on the pool; raises PasswordPoolBusy when it is full or too slow"""
+        self._ensure_pool()
+        if not self._slots.acquire(blocking=False):
+            rejected_total.inc(reason='queue_full')
+            raise PasswordPoolBusy('Too many login attempts in progress, try again shortly')
+
+        submitted_at = time.perf_counter()
+        try:
+            # In the request's context, so the account lookup counts towards its query stats
+            future = self._executor.submit(contextvars.copy_context().run, self._run, submitted_at, credentials)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=getattr(settings, 'LOGIN_PASSWORD_TIMEOUT', 10))
+        except FutureTimeoutError:
+            rejected_total.inc(reason='timeout')
+            raise PasswordPoolBusy('Login is taking too long, try again shortly')
+
+    def _run(self, submitted_at, credentials):
+        started_at = time.perf_counter()
+        queue_wait_seconds.observe(started_at - submitted_at)
+        # Pool threads live outside the request cycle, so manage their connections
+        close_old_connections()
+        try:
+            return authenticate(**credentials)
+        finally:
+            hash_seconds.observe(time.perf_counter() - started_at)
+            close_old_connections()
+
+
+password_verifier = PasswordVerifier()
@@ -0,0 +1,85 @@
+# utilities/refresh_tokens.py
+import hashlib
+import secrets
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import RefreshToken
+from utilities.jwt_utils import AuthenticationFailed
+
+
+def hash_token(raw_token):
+    return hashlib.sha256(raw_token.encode('utf-8')).hexdigest()
+
+
+def issue_refresh_token(user, family=None):
+    """Create a refresh token for user and return the raw value (never stored)"""
+    raw_token = secrets.token_urlsafe(48)
+    RefreshToken.objects.create(
+        user=user,
+        token_hash=hash_token(raw_token),
+        family=family or uuid.uuid4().hex,
+        expires_at=timezone.now() + settings.JWT_REFRESH_EXPIRATION_DELTA,
+    )
+    return raw_token
+
+
+def rotate_refresh_token(raw_token):
+    """
+    Exchange a refresh token for its successor.
+
+    Returns ``(user, new_raw_token)``. A token that was already used is treated
+    as stolen: its whole family is revoked and AuthenticationFailed is raised.
+    """
+    now = timezone.now()
+    reused_family = None
+
+    with transaction.atomic():
+        try:
+            token = RefreshToken.objects.select_for_update().select_related('user').get(
+                token_hash=hash_token(raw_token)
+            )
+        except RefreshToken.DoesNotExist:
+            raise AuthenticationFailed('Invalid refresh token')
+
+        if token.revoked_at is not None:
+            raise AuthenticationFailed('Refresh token has been revoked')
+        if token.expires_at <= now:
+            raise AuthenticationFailed('Refresh token has expired')
+        if not token.user.is_active:
+            raise AuthenticationFailed('User account is disabled')
+
+        if token.used_at is not None:
+            reused_family = token.family
+        else:
+            token.used_at = now
+            token.save(update_fields=['used_at'])
+            new_raw_token = issue_refresh_token(token.user, family=token.family)
+
+    if reused_family is not None:
+        # Revoke outside the atomic block above so it is not rolled back
+        revoke_family(reused_family)
+        raise AuthenticationFailed('Refresh token reuse detected, please log in again')
+
+    return token.user, new_raw_token
+
+
+def revoke_family(family):
+    """Revoke every live refresh token of a rotation chain"""
+    return RefreshToken.objects.filter(family=family, revoked_at__isnull=True).update(
+        revoked_at=timezone.now()
+    )
+
+
+def revoke_refresh_token(raw_token, user=None):
+    """Revoke the family of raw_token (optionally only if it belongs to user)"""
+    tokens = RefreshToken.objects.filter(token_hash=hash_token(raw_token))
+    if user is not None:
+        tokens = tokens.filter(user_id=user.pk)
+    family = tokens.values_list('family', flat=True).first()
+    if family is None:
+        return 0
+    return revoke_family(family)
@@ -0,0 +1,459 @@
+# utilities/response_cache.py
+import hashlib
+import json
+import math
+import os
+import pickle
+import random
+import tempfile
+import threading
+import time
+import logging
+import uuid
+from collections import OrderedDict
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from utilities.global_functions import is_shared_cache
+from utilities.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+cache_requests_total = registry.counter(
+    'response_cache_requests_total',
+    'Response cache lookups',
+    labelnames=('namespace', 'result'),
+)
+
+
+class LocMemResponseCacheBackend:
+    """
+    Per-process LRU with per-entry expiry.
+
+    Fastest, but every process holds its own copy and sees only its own
+    invalidations, so entries stay stale in other processes until they expire.
+    """
+
+    def __init__(self, location=None, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value, timeout):
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._set(key, value, timeout)
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                return False
+            self._set(key, value, timeout)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            if key not in self._entries:
+                raise ValueError(f'Key {key!r} not found')
+            value, expires_at = self._entries[key]
+            self._entries[key] = (value + 1, expires_at)
+            return value + 1
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class FileResponseCacheBackend:
+    """
+    One pickle file per key under ``location``, shared by every process on the host.
+
+    Writes go through a temporary file and ``os.replace`` so readers never see
+    a partial entry. When the directory holds more than ``max_entries`` files
+    the oldest third is removed.
+    """
+
+    def __init__(self, location=None, max_entries=1024):
+        self.location = location or os.path.join(tempfile.gettempdir(), 'response-cache')
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(self.location, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.location, hashlib.sha1(key.encode()).hexdigest() + '.cache')
+
+    def _read(self, path):
+        try:
+            with open(path, 'rb') as f:
+                value, expires_at = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(path)
+            return None
+        return value
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _cull(self):
+        paths = [os.path.join(self.location, name) for name in os.listdir(self.location)]
+        if len(paths) <= self.max_entries:
+            return
+        paths.sort(key=lambda path: os.stat(path).st_mtime if os.path.exists(path) else 0)
+        for path in paths[:len(paths) // 3]:
+            self._remove(path)
+
+    def get(self, key):
+        return self._read(self._path(key))
+
+    def _write(self, key, value, timeout, replace=True):
+        expires_at = None if timeout is None else time.time() + timeout
+        fd, tmp_path = tempfile.mkstemp(dir=self.location, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((value, expires_at), f, pickle.HIGHEST_PROTOCOL)
+            if replace:
+                os.replace(tmp_path, self._path(key))
+                return True
+            try:
+                # link() fails if the entry exists, making add() atomic across processes
+                os.link(tmp_path, self._path(key))
+                return True
+            except FileExistsError:
+                return False
+        finally:
+            self._remove(tmp_path)
+
+    def set(self, key, value, timeout=None):
+        self._write(key, value, timeout)
+        self._cull()
+
+    def add(self, key, value, timeout=None):
+        # Drops the entry first if it has expired
+        self.get(key)
+        return self._write(key, value, timeout, replace=False)
+
+    def delete(self, key):
+        self._remove(self._path(key))
+
+    def incr(self, key):
+        # Atomic within a process only; a lost increment across processes still
+        # changes the version, which is all invalidation needs
+        with self._lock:
+            value = self.get(key)
+            if value is None:
+                raise ValueError(f'Key {key!r} not found')
+            self.set(key, value + 1)
+            return value + 1
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.delete(key)
+
+
+class DjangoResponseCacheBackend:
+    """
+    Entries in a Django cache alias (``location``, default ``default``),
+    shared by every process when the alias is a shared ``CACHES`` backend
+    (e.g. Redis). A local-memory alias is per process, so invalidations
+    would not reach the other workers; that is logged as a warning.
+    """
+
+    def __init__(self, location=None, max_entries=None):
+        self.alias = location or 'default'
+        self.key_prefix = 'response-cache'
+        if not is_shared_cache(caches[self.alias]):
+            logger.warning(
+                'Response cache alias %r is not a shared cache: other worker processes '
+                'keep serving invalidated responses until they expire', self.alias
+            )
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, key):
+        return f'{self.key_prefix}:{key}'
+
+    def get(self, key):
+        return self.cache.get(self._key(key))
+
+    def set(self, key, value, timeout=None):
+        self.cache.set(self._key(key), value, timeout)
+
+    def add(self, key, value, timeout=None):
+        return self.cache.add(self._key(key), value, timeout)
+
+    def delete(self, key):
+        self.cache.delete(self._key(key))
+
+    def incr(self, key):
+        return self.cache.incr(self._key(key))
+
+    def delete_many(self, keys):
+        self.cache.delete_many([self._key(key) for key in keys])
+
+
+RESPONSE_CACHE_BACKENDS = {
+    'locmem': LocMemResponseCacheBackend,
+    'file': FileResponseCacheBackend,
+    'django': DjangoResponseCacheBackend,
+}
+
+
+class CacheTicket:
+    """Handed out on a miss: the holder rebuilds the entry and passes the ticket to ResponseCache.set()"""
+    __slots__ = ('key', 'lock_token', 'started_at')
+
+    def __init__(self, key, lock_token=None):
+        self.key = key
+        self.lock_token = lock_token
+        self.started_at = time.perf_counter()
+
+
+class ResponseCache:
+    """
+    Cache of rendered public responses with version-based invalidation.
+
+    Keys embed version counters instead of being deleted one by one:
+
+    * ``list`` - unfiltered list keys include the global list generation,
+      lists filtered by author include that author's version instead. A write
+      by an author bumps both, so cached unfiltered lists and that author's
+      lists stop matching while other authors' filtered lists stay cached.
+    * ``detail`` - one key per post, deleted when the post changes.
+
+    Versions missing from the backend (evicted or never set) start from the
+    current time in milliseconds, so a reset can never bring back old keys.
+    Invalidation waits for the current transaction to commit, otherwise a
+    concurrent request could cache the old rows again under the new versions.
+
+    Rebuilds are single-flight: only the request holding the key's rebuild
+    lock recomputes it. While it does, others get the previous entry if it is
+    within ``RESPONSE_CACHE_STALE_TTL`` of expiring (stale-while-revalidate),
+    or wait up to ``RESPONSE_CACHE_LOCK_WAIT`` seconds for the new one.
+    Entries are also refreshed a little before they expire, with a probability
+    that grows as expiry nears and with how long the entry took to build
+    (XFetch), so popular keys are usually rebuilt before anyone sees a miss.
+    """
+    version_timeout = None
+    poll_interval = 0.05
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._backend = None
+        self._stats = {}
+
+    @property
+    def enabled(self):
+        return bool(getattr(settings, 'RESPONSE_CACHE_BACKEND', ''))
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60)
+
+    @property
+    def stale_timeout(self):
+        return getattr(settings, 'RESPONSE_CACHE_STALE_TTL', 30)
+
+    @property
+    def lock_timeout(self):
+        return getattr(settings, 'RESPONSE_CACHE_LOCK_TIMEOUT', 10)
+
+    @property
+    def lock_wait(self):
+        return getattr(settings, 'RESPONSE_CACHE_LOCK_WAIT', 2.0)
+
+    @property
+    def early_expiry_beta(self):
+        return getattr(settings, 'RESPONSE_CACHE_EARLY_EXPIRY_BETA', 1.0)
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    name = settings.RESPONSE_CACHE_BACKEND
+                    backend_class = RESPONSE_CACHE_BACKENDS.get(name) or import_string(name)
+                    self._backend = backend_class(
+                        location=getattr(settings, 'RESPONSE_CACHE_LOCATION', None) or None,
+                        max_entries=getattr(settings, 'RESPONSE_CACHE_MAX_ENTRIES', 1024),
+                    )
+        return self._backend
+
+    def get_version(self, name):
+        key = f'version:{name}'
+        version = self.backend.get(key)
+        if version is None:
+            self.backend.add(key, int(time.time() * 1000), self.version_timeout)
+            version = self.backend.get(key)
+        return version
+
+    def bump_version(self, name):
+        key = f'version:{name}'
+        try:
+            return self.backend.incr(key)
+        except ValueError:
+            self.backend.set(key, int(time.time() * 1000), self.version_timeout)
+
+    def list_key(self, params):
+        """Key of a list response; params must already be normalized"""
+        if params.get('author'):
+            try:
+                # ?author=01 and ?author=1 are the same list (and the same version)
+                params = {**params, 'author': str(int(params['author']))}
+            except ValueError:
+                pass
+            # Only this author's writes can change an author-filtered list
+            version = f'a{self.get_version("author:" + params["author"])}'
+        else:
+            version = f'g{self.get_version("list")}'
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+        return f'list:{version}:{digest}'
+
+    def detail_key(self, post_id):
+        return f'detail:{post_id}'
+
+    def _record(self, namespace, result):
+        with self._lock:
+            counts = self._stats.setdefault(namespace, {'hit': 0, 'stale': 0, 'miss': 0})
+            counts[result] += 1
+        cache_requests_total.inc(namespace=namespace, result=result)
+
+    def _acquire(self, key):
+        token = uuid.uuid4().hex
+        if self.backend.add(f'lock:{key}', token, self.lock_timeout):
+            return token
+        return None
+
+    def _release(self, key, token):
+        # Not atomic, but a lock is only ever taken over after lock_timeout
+        if self.backend.get(f'lock:{key}') == token:
+            self.backend.delete(f'lock:{key}')
+
+    def _needs_refresh(self, record, now):
+        """True once the entry expired, or early with probability rising towards expiry"""
+        beta = self.early_expiry_beta
+        if beta <= 0:
+            return now >= record['expires_at']
+        return now - record['build_seconds'] * beta * math.log(random.random() or 1e-12) >= record['expires_at']
+
+    def get(self, namespace, key):
+        """
+        Look key up. Returns ``(entry, ticket)``: exactly one is not None.
+
+        With a ticket the caller must rebuild the entry and call
+        ``set(ticket, entry)`` (even if it ends up not caching anything,
+        ``release(ticket)``).
+        """
+        record = self.backend.get(key)
+        now = time.time()
+
+        if record is not None:
+            if not self._needs_refresh(record, now):
+                self._record(namespace, 'hit')
+                return record['entry'], None
+            token = self._acquire(key)
+            if token is not None:
+                self._record(namespace, 'miss')
+                return None, CacheTicket(key, token)
+            # Someone else is rebuilding: serve what we have meanwhile
+            self._record(namespace, 'hit' if now < record['expires_at'] else 'stale')
+            return record['entry'], None
+
+        token = self._acquire(key)
+        if token is None:
+            # Wait for the request that holds the lock instead of rebuilding too
+            deadline = time.monotonic() + self.lock_wait
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                record = self.backend.get(key)
+                if record is not None:
+                    self._record(namespace, 'hit')
+                    return record['entry'], None
+        self._record(namespace, 'miss')
+        return None, CacheTicket(key, token)
+
+    def set(self, ticket, entry):
+        """Store the rebuilt entry for ticket's key and release its lock"""
+        try:
+            self.backend.set(
+                ticket.key,
+                {
+                    'entry': entry,
+                    'expires_at': time.time() + self.timeout,
+                    'build_seconds': time.perf_counter() - ticket.started_at,
+                },
+                # Kept past expiry so it can be served while being rebuilt
+                self.timeout + self.stale_timeout,
+            )
+        finally:
+            self.release(ticket)
+
+    def release(self, ticket):
+        if ticket.lock_token is not None:
+            self._release(ticket.key, ticket.lock_token)
+            ticket.lock_token = None
+
+    def invalidate_author(self, author_id):
+        """Drop every list that can contain author_id's posts"""
+        self.invalidate_posts((), author_id)
+
+    def invalidate_post(self, post_id, author_id):
+        self.invalidate_posts((post_id,), author_id)
+
+    def invalidate_posts(self, post_ids, author_id):
+        """Invalidate after a bulk write by one author (no per-row signals), once it commits"""
+        transaction.on_commit(partial(self._invalidate, list(post_ids), author_id))
+
+    def _invalidate(self, post_ids, author_id):
+        if post_ids:
+            self.backend.delete_many([self.detail_key(post_id) for post_id in post_ids])
+        self.bump_version('list')
+        self.bump_version(f'author:{author_id}')
+
+    def stats(self):
+        """Hits, stale hits, misses and hit ratio per namespace for this process"""
+        with self._lock:
+            return {
+                namespace: {
+                    **counts,
+                    'hit_ratio': (counts['hit'] + counts['stale']) / (sum(counts.values()) or 1),
+                }
+                for namespace, counts in self._stats.items()
+            }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,125 @@
+# utilities/revocation.py
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils import timezone as django_timezone
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)"""
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class RevocationList:
+    """
+    Revoked access-token ids (``jti``) with a constant-time happy path.
+
+    ``RevokedToken`` rows are the source of truth. Each process keeps a Bloom
+    filter of the unexpired ones: a miss proves the token is not revoked without
+    any I/O. Only filter hits (real revocations or rare false positives) are
+    confirmed through the cache and then the table. Every
+    ``JWT_REVOCATION_SYNC_INTERVAL`` seconds a process reads the table's
+    highest id (one indexed query) and rebuilds its filter when rows were
+    added, so revocations reach every process whatever the cache backend.
+    """
+    key_prefix = 'jwt-revoked'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._generation = None
+        self._next_sync = 0.0
+
+    @property
+    def sync_interval(self):
+        return getattr(settings, 'JWT_REVOCATION_SYNC_INTERVAL', 5)
+
+    def is_revoked(self, jti):
+        self._sync()
+        if jti not in self._filter:
+            return False
+
+        if cache.get(f'{self.key_prefix}:{jti}'):
+            return True
+        from accounts.models import RevokedToken
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, jti, expires_at):
+        """Revoke jti until expires_at (aware datetime or unix timestamp)"""
+        from accounts.models import RevokedToken
+
+        if not isinstance(expires_at, datetime):
+            expires_at = datetime.fromtimestamp(expires_at, tz=timezone.utc)
+
+        now = django_timezone.now()
+        RevokedToken.objects.filter(expires_at__lte=now).delete()
+        RevokedToken.objects.get_or_create(jti=jti, defaults={'expires_at': expires_at})
+
+        timeout = int((expires_at - now).total_seconds())
+        if timeout > 0:
+            cache.set(f'{self.key_prefix}:{jti}', True, timeout)
+
+        self._sync()
+        with self._lock:
+            self._filter.add(jti)
+
+    def _sync(self):
+        now = time.monotonic()
+        if self._filter is not None and now < self._next_sync:
+            return
+
+        with self._lock:
+            if self._filter is not None and now < self._next_sync:
+                return
+            generation = self._get_generation()
+            if self._filter is None or generation != self._generation:
+                self._filter = self._build_filter()
+                self._generation = generation
+            self._next_sync = now + self.sync_interval
+
+    @staticmethod
+    def _get_generation():
+        # Ids only grow, so a new highest id means rows were added since the last build
+        from accounts.models import RevokedToken
+        return RevokedToken.objects.aggregate(generation=Max('pk'))['generation']
+
+    def _build_filter(self):
+        from accounts.models import RevokedToken
+
+        bloom = BloomFilter(
+            capacity=getattr(settings, 'JWT_REVOCATION_BLOOM_CAPACITY', 100000),
+            error_rate=getattr(settings, 'JWT_REVOCATION_BLOOM_ERROR_RATE', 0.001),
+        )
+        jtis = RevokedToken.objects.filter(
+            expires_at__gt=django_timezone.now()
+        ).values_list('jti', flat=True)
+        for jti in jtis.iterator(chunk_size=2000):
+            bloom.add(jti)
+        return bloom
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,225 @@
+# utilities/search.py
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.models import F, FloatField, Lookup, Q, Value
+from django.db.models.functions import Greatest
+
+# Queries are tokenised into quoted phrases and bare terms; only word
+# characters survive so user input can never break the tsquery syntax.
+TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+WORD_RE = re.compile(r'[^\W_]+')
+
+
+def get_search_config():
+    """Text search configuration used for vectors and queries"""
+    return getattr(settings, 'SEARCH_CONFIG', 'english')
+
+
+def supports_full_text(using=None):
+    """Full-text search needs PostgreSQL"""
+    return connections[using or 'default'].vendor == 'postgresql'
+
+
+def build_search_vector(weighted_expressions, config=None):
+    """
+    Combine (expression, weight) pairs into a single weighted SearchVector.
+
+    Expressions may be field names (for UPDATE/backfill) or Value()s built from
+    in-memory instance data (usable inside an INSERT).
+    """
+    config = config or get_search_config()
+    vector = None
+    for expression, weight in weighted_expressions:
+        part = SearchVector(expression, weight=weight, config=config)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def build_tsquery(query):
+    """
+    Translate a user search string into a raw tsquery.
+
+    * ``"exact phrase"`` -> words joined with ``<->``
+    * ``term*``          -> prefix match ``term:*``
+    * everything else is AND-ed together.
+
+    Returns an empty string when nothing searchable is left.
+    """
+    parts = []
+    for phrase, term in TOKEN_RE.findall(query):
+        if phrase:
+            words = WORD_RE.findall(phrase)
+            if len(words) > 1:
+                parts.append('(' + ' <-> '.join(words) + ')')
+            elif words:
+                parts.append(words[0])
+            continue
+
+        words = WORD_RE.findall(term)
+        if not words:
+            continue
+        if term.endswith('*'):
+            words[-1] = f'{words[-1]}:*'
+        parts.extend(words)
+
+    return ' & '.join(parts)
+
+
+class ContainsSearchBackend:
+    """Case-insensitive substring search (ILIKE '%q%') over the given fields"""
+
+    def search(self, queryset, fields, query):
+        q_objects = Q()
+        for field in fields:
+            q_objects |= Q(**{f'{field}__icontains': query})
+
+        # Constant rank so ``ordering=relevance`` still works on this backend
+        return queryset.filter(q_objects).annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+
+class FullTextSearchBackend:
+    """
+    PostgreSQL full-text search ranked with ts_rank.
+
+    Uses the model's stored ``search_vector`` column (GIN indexed) when it has
+    one, otherwise builds the vector from ``fields`` on the fly. Falls back to
+    ContainsSearchBackend on other databases or when the query has no words.
+    """
+    vector_field = 'search_vector'
+    fallback = ContainsSearchBackend
+
+    def search(self, queryset, fields, query):
+        tsquery = build_tsquery(query)
+        if not tsquery or not supports_full_text(queryset.db):
+            return self.fallback().search(queryset, fields, query)
+
+        search_query = SearchQuery(tsquery, search_type='raw', config=get_search_config())
+
+        if self.has_vector_field(queryset.model):
+            vector = F(self.vector_field)
+            queryset = queryset.filter(**{self.vector_field: search_query})
+        else:
+            vector = build_search_vector([(field, None) for field in fields])
+            queryset = queryset.annotate(_search_vector=vector).filter(_search_vector=search_query)
+
+        return queryset.annotate(search_rank=SearchRank(vector, search_query))
+
+    def has_vector_field(self, model):
+        return any(field.name == self.vector_field for field in model._meta.concrete_fields)
+
+
+class TrigramContains(Lookup):
+    """
+    ``field ILIKE '%query%'``.
+
+    Django compiles ``icontains`` to ``UPPER(field::text) LIKE UPPER(...)`` on
+    PostgreSQL, which a ``gin_trgm_ops`` index on the plain column cannot
+    serve. ILIKE on the column itself can, so the same index also answers the
+    similarity operators.
+    """
+    lookup_name = 'trigram_contains'
+
+    def process_rhs(self, compiler, connection):
+        rhs, params = super().process_rhs(compiler, connection)
+        params = [f'%{connection.ops.prep_for_like_query(param)}%' for param in params]
+        return rhs, params
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} ILIKE {rhs}', [*lhs_params, *rhs_params]
+
+
+class TrigramSearchBackend:
+    """
+    Substring search served by pg_trgm GIN indexes (``gin_trgm_ops``).
+
+    Keeps the exact ``icontains`` semantics of ContainsSearchBackend; the
+    trigram indexes turn the ILIKE '%q%' scans into index lookups. Results
+    are ranked by word similarity. With ``fuzzy`` enabled, rows whose words
+    are within ``threshold`` word similarity of the query also match, which
+    tolerates typos.
+    """
+    fuzzy = False
+    # None falls back to settings.SEARCH_TRIGRAM_THRESHOLD
+    threshold = None
+    fallback = ContainsSearchBackend
+
+    def search(self, queryset, fields, query):
+        if not supports_full_text(queryset.db):
+            return self.fallback().search(queryset, fields, query)
+
+        q_objects = Q()
+        for field in fields:
+            q_objects |= Q(TrigramContains(F(field), query))
+
+        if self.fuzzy:
+            self.set_threshold(queryset.db)
+            for field in fields:
+                # "field %> query" is answered by the same GIN trigram index
+                q_objects |= Q(**{f'{field}__trigram_word_similar': query})
+
+        similarities = [TrigramWordSimilarity(query, field) for field in fields]
+        rank = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        return queryset.filter(q_objects).annotate(search_rank=rank)
+
+    def get_threshold(self):
+        if self.threshold is not None:
+            return self.threshold
+        return getattr(settings, 'SEARCH_TRIGRAM_THRESHOLD', 0.6)
+
+    def set_threshold(self, using):
+        """
+        The %> operator compares against pg_trgm.word_similarity_threshold, so
+        set it on the connection that will run the query. Setting it every time
+        keeps views with different thresholds from leaking into each other.
+        """
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, false)",
+                [str(self.get_threshold())],
+            )
+
+
+class FuzzyTrigramSearchBackend(TrigramSearchBackend):
+    """TrigramSearchBackend with typo-tolerant similarity matching enabled"""
+    fuzzy = True
+
+
+# search_fields entries may carry a prefix selecting the backend, the same
+# way Django admin's search_fields do ("@title" -> full-text search).
+SEARCH_BACKENDS = {
+    '': ContainsSearchBackend,
+    '@': FullTextSearchBackend,
+    '%': TrigramSearchBackend,
+    '~': FuzzyTrigramSearchBackend,
+}
+
+
+def resolve_search_fields(search_fields):
+    """Split prefixed search_fields into (backend instance, field names)"""
+    backend_class = None
+    fields = []
+    for entry in search_fields:
+        prefix = entry[0] if entry[0] in SEARCH_BACKENDS else ''
+        field = entry[len(prefix):]
+        entry_backend = SEARCH_BACKENDS[prefix]
+        if backend_class is not None and entry_backend is not backend_class:
+            raise ImproperlyConfigured(
+                f'search_fields must all use the same search backend prefix: {search_fields}'
+            )
+        backend_class = entry_backend
+        fields.append(field)
+
+    return (backend_class or ContainsSearchBackend)(), fields
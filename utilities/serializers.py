@@ -0,0 +1,56 @@
+# utilities/serializers.py
+
+
+class ValuesSerializer:
+    """
+    Declarative serializer building response dicts straight from ``.values()`` rows.
+
+    ``fields`` maps each output key, in output order, to a column: any
+    ``values()`` lookup (``author__username``) or annotation, or a dict of
+    them for a nested object. ``values()`` selects only the columns behind
+    the chosen fields and ``serialize()`` turns one row into its output
+    dict, so rows are never instantiated as models (no ``__init__``,
+    ``from_db`` or related instances per row).
+    """
+    fields = {}
+    # Output keys used when none are requested, None for all of them
+    default_fields = None
+
+    def __init__(self, fields=None):
+        if fields is None:
+            fields = self.default_fields or self.fields
+        unknown = [name for name in fields if name not in self.fields]
+        if unknown:
+            raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+        self.field_names = [name for name in self.fields if name in fields]
+        # (key, column, None) or (key, None, [(nested key, column), ...]),
+        # resolved once rather than per row
+        self.plan = []
+        for name in self.field_names:
+            source = self.fields[name]
+            if isinstance(source, str):
+                self.plan.append((name, source, None))
+            else:
+                self.plan.append((name, None, list(source.items())))
+
+    def get_columns(self):
+        """The values() lookups behind the chosen fields"""
+        columns = []
+        for name in self.field_names:
+            source = self.fields[name]
+            columns.extend([source] if isinstance(source, str) else source.values())
+        return columns
+
+    def values(self, queryset, extra=()):
+        """Turn queryset into a values() queryset of the chosen fields plus extra lookups"""
+        return queryset.values(*dict.fromkeys([*extra, *self.get_columns()]))
+
+    def serialize(self, row):
+        """Output dict of one values() row"""
+        data = {}
+        for name, column, nested in self.plan:
+            data[name] = row[column] if nested is None else {key: row[source] for key, source in nested}
+        return data
+
+    def serialize_many(self, rows):
+        return [self.serialize(row) for row in rows]
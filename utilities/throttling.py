@@ -0,0 +1,76 @@
+# utilities/throttling.py
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def get_client_ip(request):
+    """
+    Client address of request. Behind reverse proxies set CLIENT_IP_HEADER
+    (e.g. "X-Forwarded-For") and CLIENT_IP_PROXY_COUNT to the number of
+    proxies in front of the app: the address is taken that many entries from
+    the right of the header, as entries further left are client supplied.
+    Without the header (or with too few entries) it is REMOTE_ADDR.
+    """
+    header = getattr(settings, 'CLIENT_IP_HEADER', '')
+    if header:
+        meta_key = 'HTTP_' + header.upper().replace('-', '_')
+        addresses = [address.strip() for address in request.META.get(meta_key, '').split(',')]
+        addresses = [address for address in addresses if address]
+        proxy_count = getattr(settings, 'CLIENT_IP_PROXY_COUNT', 1)
+        if proxy_count > 0 and len(addresses) >= proxy_count:
+            return addresses[-proxy_count]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def parse_rate(rate):
+    """Parse '<count>/<period>' (e.g. '5/min') into (count, seconds)"""
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period]
+
+
+class TokenBucket:
+    """
+    Token bucket kept in the Django cache.
+
+    A bucket holds up to ``capacity`` tokens and refills continuously at
+    ``capacity`` per ``period``. The read-modify-write is not atomic across
+    processes, so under heavy contention a few extra requests may pass; that is
+    acceptable for throttling, which only has to stop sustained bursts.
+    """
+
+    def __init__(self, scope, rate, cache_alias='default'):
+        self.scope = scope
+        self.capacity, self.period = parse_rate(rate)
+        self.refill_rate = self.capacity / self.period
+        self.cache_alias = cache_alias
+
+    def peek(self, key, tokens=1):
+        """Whether tokens could be taken for key, without taking them. Returns (allowed, retry_after_seconds)"""
+        available = self._available(caches[self.cache_alias], key, time.time())
+        if available < tokens:
+            return False, (tokens - available) / self.refill_rate
+        return True, 0.0
+
+    def consume(self, key, tokens=1):
+        """Take tokens for key. Returns (allowed, retry_after_seconds)"""
+        cache = caches[self.cache_alias]
+        now = time.time()
+        available = self._available(cache, key, now)
+
+        if available < tokens:
+            retry_after = (tokens - available) / self.refill_rate
+            return False, retry_after
+
+        cache.set(self._cache_key(key), (available - tokens, now), self.period)
+        return True, 0.0
+
+    def _cache_key(self, key):
+        return f'throttle:{self.scope}:{key}'
+
+    def _available(self, cache, key, now):
+        available, updated_at = cache.get(self._cache_key(key), (self.capacity, now))
+        return min(self.capacity, available + (now - updated_at) * self.refill_rate)
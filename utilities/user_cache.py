@@ -0,0 +1,146 @@
+# utilities/user_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+
+from utilities.global_functions import is_shared_cache
+
+
+class UserCache:
+    """
+    Two-tier cache of authenticated accounts keyed by user id.
+
+    * local  - per-process LRU, entries live at most ``JWT_USER_CACHE_LOCAL_TIMEOUT``
+      seconds. This bounds how long another process can serve an account
+      after it was changed, since signals only evict in the process that saved it.
+    * shared - optional Django cache (``JWT_USER_CACHE_ALIAS``), entries live at
+      most ``JWT_USER_CACHE_TIMEOUT`` seconds and never past the token's ``exp``.
+      Eviction reaches it from every process, so it is skipped when the alias
+      is a per-process (local memory) cache that would outlive the local tier.
+
+    Rows are stored as field values, without the password hash (it comes back
+    deferred), and rebuilt with ``Model.from_db`` on every hit, so requests
+    never share (and mutate) the same instance.
+    """
+    key_prefix = 'jwt-user'
+
+    def __init__(self):
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self):
+        return getattr(settings, 'JWT_USER_CACHE_SIZE', 1024)
+
+    @property
+    def local_timeout(self):
+        return getattr(settings, 'JWT_USER_CACHE_LOCAL_TIMEOUT', 30)
+
+    @property
+    def shared_timeout(self):
+        return getattr(settings, 'JWT_USER_CACHE_TIMEOUT', 300)
+
+    @property
+    def shared(self):
+        alias = getattr(settings, 'JWT_USER_CACHE_ALIAS', 'default')
+        if not alias or not is_shared_cache(caches[alias]):
+            return None
+        return caches[alias]
+
+    def key(self, user_id):
+        return f'{self.key_prefix}:{user_id}'
+
+    def get(self, user_id):
+        """Return a fresh user instance for user_id, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(user_id)
+            if entry is not None:
+                row, expires_at = entry
+                if expires_at > now:
+                    self._local.move_to_end(user_id)
+                    return self._build(row)
+                del self._local[user_id]
+
+        shared = self.shared
+        if shared is None:
+            return None
+        row = shared.get(self.key(user_id))
+        if row is None:
+            return None
+        self._store_local(user_id, row)
+        return self._build(row)
+
+    def set(self, user, token_exp=None):
+        """Cache user in both tiers; token_exp (unix time) caps the shared TTL"""
+        row = self._row(user)
+        self._store_local(user.pk, row)
+
+        shared = self.shared
+        if shared is None:
+            return
+        timeout = self.shared_timeout
+        if token_exp is not None:
+            timeout = min(timeout, int(token_exp - time.time()))
+        if timeout > 0:
+            shared.set(self.key(user.pk), row, timeout)
+
+    def evict(self, user_id):
+        """Drop user_id from the local tier and the shared tier"""
+        with self._lock:
+            self._local.pop(user_id, None)
+        shared = self.shared
+        if shared is not None:
+            shared.delete(self.key(user_id))
+
+    def get_token_version(self, user_id):
+        """
+        Current token_version of user_id as published by set_token_version,
+        None when unknown. Always None without a shared tier: a version
+        published in one process's memory would never see another process
+        revoke the account's tokens.
+        """
+        shared = self.shared
+        if shared is None:
+            return None
+        return shared.get(f'{self.key_prefix}-version:{user_id}')
+
+    def set_token_version(self, user_id, version):
+        """Publish user_id's token_version so stateless tokens can be checked without a query"""
+        shared = self.shared
+        if shared is None:
+            return
+        # Tokens carrying an older version can live for JWT_EXPIRATION_DELTA
+        timeout = int(settings.JWT_EXPIRATION_DELTA.total_seconds())
+        shared.set(f'{self.key_prefix}-version:{user_id}', version, timeout)
+
+    def clear(self):
+        """Empty the local tier (the shared tier expires on its own)"""
+        with self._lock:
+            self._local.clear()
+
+    def _store_local(self, user_id, row):
+        with self._lock:
+            self._local[user_id] = (row, time.monotonic() + self.local_timeout)
+            self._local.move_to_end(user_id)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def _row(self, user):
+        # Field names travel with the values so entries written before a
+        # schema change still rebuild (missing columns come back deferred)
+        field_names = tuple(
+            field.attname for field in user._meta.concrete_fields if field.attname != 'password'
+        )
+        return field_names, tuple(getattr(user, name) for name in field_names)
+
+    def _build(self, row):
+        field_names, values = row
+        return get_user_model().from_db('default', field_names, values)
+
+
+user_cache = UserCache()